@@ -0,0 +1,46 @@
+from array import array
+from collections.abc import Callable
+from itertools import compress
+
+
+class Compaction:
+    """Resumable copy of the entries kept from parallel packed arrays
+
+    Entries are copied to new arrays, in order, at most $max_entries per
+    step(), so compacting an array of any size is spread over bounded
+    steps. Sources stay untouched and readable meanwhile, and may grow at
+    their end: the copy is done once it has caught up with them.
+
+    The last source holds the post indices tested by $is_kept.
+    """
+
+    __slots__ = ("sources", "targets", "cursor")
+
+    def __init__(self, *sources: array):
+        self.sources = sources
+        self.targets = tuple(
+            array(s.typecode) if type(s) is array else type(s)() for s in sources
+        )
+        self.cursor = 0
+
+    @property
+    def done(self) -> bool:
+        return self.cursor >= len(self.sources[-1])
+
+    def step(self, is_kept: Callable[[int], bool], max_entries: int) -> int:
+        """Copy kept entries among the next $max_entries of sources
+
+        Args:
+            is_kept (Callable[[int], bool]): post indice -> True to keep it
+            max_entries (int): bound of work
+
+        Returns:
+            int: entries scanned
+        """
+        start = self.cursor
+        end = min(start + max_entries, len(self.sources[-1]))
+        keep = list(map(is_kept, self.sources[-1][start:end]))
+        for source, target in zip(self.sources, self.targets):
+            target.extend(compress(source[start:end], keep))
+        self.cursor = end
+        return end - start
@@ -0,0 +1,47 @@
+import csv
+from array import array
+from collections.abc import Iterable
+
+LIST_COLUMN_SUFFIX = "_offsets"
+
+
+def write_csv(path: str, batches: Iterable[dict[str, array | list]]) -> int:
+    """Write columnar record batches to a CSV file, one batch at a time
+
+    A list column is a flat column "x" with its "x_offsets" column, as in
+    Yodelr exports. It is written as one cell of space separated values.
+
+    Args:
+        path (str): CSV file
+        batches (Iterable[dict[str, array | list]]): record batches
+
+    Returns:
+        int: rows written
+    """
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        header = None
+        for batch in batches:
+            names = [name for name in batch if not name.endswith(LIST_COLUMN_SUFFIX)]
+            if header is None:
+                header = names
+                writer.writerow(header)
+            columns = [
+                (
+                    _split(batch[name], batch[name + LIST_COLUMN_SUFFIX])
+                    if name + LIST_COLUMN_SUFFIX in batch
+                    else batch[name]
+                )
+                for name in names
+            ]
+            writer.writerows(zip(*columns))
+            rows += len(columns[0])
+    return rows
+
+
+def _split(values: array, offsets: array) -> list[str]:
+    return [
+        " ".join(map(str, values[offsets[i] : offsets[i + 1]]))
+        for i in range(len(offsets) - 1)
+    ]
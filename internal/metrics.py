@@ -0,0 +1,167 @@
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from collections.abc import Callable
+
+SUB_BUCKETS = 8
+
+
+class LatencyHistogram:
+    """Fixed log-scale histogram of latencies in seconds
+
+    Bucket upper bounds double from 1µs to ~1h, each doubling split in
+    $SUB_BUCKETS geometric sub-buckets. Observing is a bisection on 256
+    bounds and a percentile is reported as its bucket upper bound, ie.
+    within 2^(1/8), about 9%, of the exact value.
+    """
+
+    SUB_BUCKETS = SUB_BUCKETS
+    BOUNDS: tuple[float, ...] = tuple(
+        1e-6 * 2 ** (i / SUB_BUCKETS) for i in range(32 * SUB_BUCKETS)
+    )
+
+    def __init__(self):
+        self.counts: list[int] = [0] * (len(self.BOUNDS) + 1)  # last is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency
+
+        Args:
+            seconds (float): latency
+        """
+        self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add observations of $other to this histogram
+
+        Args:
+            other (LatencyHistogram): histogram
+        """
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.count += other.count
+        self.sum += other.sum
+
+    def percentile(self, q: float) -> float:
+        """Estimate the $q-th percentile
+
+        Args:
+            q (float): percentile between 0 and 100
+
+        Returns:
+            float: bucket upper bound holding the percentile, 0.0 if empty
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c > 0:
+                return self.BOUNDS[i] if i < len(self.BOUNDS) else float("inf")
+        return float("inf")
+
+
+class Metrics:
+    """Per-operation call counts, cumulative time and latency histograms"""
+
+    PREFIX = "yodelr"
+
+    def __init__(self):
+        self.histograms: dict[str, LatencyHistogram] = dict()
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record latency of one call of operation $name
+
+        Args:
+            name (str): operation
+            seconds (float): latency
+        """
+        histogram = self.histograms.get(name, None)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Summary of every operation observed
+
+        Returns:
+            dict[str, dict[str, float]]: operation -> count, total, p50, p99
+        """
+        return {
+            name: {
+                "count": h.count,
+                "total_seconds": h.sum,
+                "p50_seconds": h.percentile(50),
+                "p99_seconds": h.percentile(99),
+            }
+            for name, h in self.histograms.items()
+        }
+
+    def to_prometheus(self, gauges: dict[str, int]) -> str:
+        """Render histograms and $gauges in Prometheus text format
+
+        Args:
+            gauges (dict[str, int]): gauge name -> value
+
+        Returns:
+            str: exposition text
+        """
+        p = self.PREFIX
+        lines = [
+            f"# HELP {p}_call_seconds Latency of Yodelr API calls.",
+            f"# TYPE {p}_call_seconds histogram",
+        ]
+        for name, h in self.histograms.items():
+            cumulative = 0
+            for i, (bound, c) in enumerate(zip(h.BOUNDS, h.counts)):
+                cumulative += c
+                # NOTE only doubling bounds are exposed, cumulative is exact
+                if i % h.SUB_BUCKETS == 0:
+                    lines.append(
+                        f'{p}_call_seconds_bucket{{method="{name}",le="{bound:g}"}} {cumulative}'
+                    )
+            lines.append(
+                f'{p}_call_seconds_bucket{{method="{name}",le="+Inf"}} {h.count}'
+            )
+            lines.append(f'{p}_call_seconds_sum{{method="{name}"}} {h.sum}')
+            lines.append(f'{p}_call_seconds_count{{method="{name}"}} {h.count}')
+        for name, value in gauges.items():
+            lines.append(f"# TYPE {p}_{name} gauge")
+            lines.append(f"{p}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def timed(method: Callable) -> Callable:
+    """Decorate a Yodelr method to observe its latency in `self._metrics`
+
+    The call is also the root span of `self._spans` when spans are enabled.
+    When both are off, the only overhead is two attribute lookups.
+
+    Args:
+        method (Callable): method to time
+
+    Returns:
+        Callable: wrapped method
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self._metrics
+        spans = self._spans
+        if metrics is None and not spans.enabled:
+            return method(self, *args, **kwargs)
+        start = perf_counter()
+        try:
+            with spans.span(name):
+                return method(self, *args, **kwargs)
+        finally:
+            if metrics is not None:
+                metrics.observe(name, perf_counter() - start)
+
+    return wrapper
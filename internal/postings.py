@@ -0,0 +1,121 @@
+from array import array
+from bisect import bisect_right
+from heapq import merge
+from collections.abc import Iterable, Iterator, Sequence
+
+
+class PostingList(array):
+    """Compressed posting list of post indices, sorted ASC
+
+    Indices are packed as unsigned 32-bit integers in a contiguous buffer,
+    ie. 4 bytes per entry instead of a pointer to an int object (~36 bytes)
+    in a list. Random access stays O(1) so bisect and galloping intersection
+    work unchanged, and iteration in reverse is native.
+
+    Post indices increase monotonically, so append keeps the list sorted.
+    """
+
+    __slots__ = ()
+
+    TYPECODE = "I"
+
+    def __new__(cls, values: Iterable[int] = ()):
+        return super().__new__(cls, cls.TYPECODE, values)
+
+    def append(self, ind: int) -> None:
+        """Append $ind at the end, ignored if already the last indice
+
+        Args:
+            ind (int): post indice, greater or equal than the last one
+
+        Raises:
+            ValueError: if $ind would break the ASC order
+        """
+        if len(self) > 0:
+            last = self[-1]
+            if ind == last:
+                return
+            if ind < last:
+                raise ValueError(f"ERR: indice {ind} lower than last {last}.")
+        super().append(ind)
+
+
+def gallop_desc(l: Sequence[int], x: int, hi: int) -> int:
+    """Find insertion point of $x in $l[:hi], searching backward from $hi
+
+    Galloping (exponential) search followed by a binary search on the
+    bracketed range. Cost is O(log d) where d is the distance from $hi,
+    which makes it cheap when walking a posting list from newest to oldest.
+
+    Args:
+        l (Sequence[int]): ascending sorted list
+        x (int): value to locate
+        hi (int): exclusive upper bound of the search
+
+    Returns:
+        int: position p such that all l[:p] <= x < l[p:hi]
+    """
+    step = 1
+    lo = hi - step
+    while lo > 0 and l[lo] > x:
+        step <<= 1
+        lo = hi - step
+    return bisect_right(l, x, max(lo, 0), hi)
+
+
+def intersect_desc(lists: list[Sequence[int]]) -> Iterator[int]:
+    """Yield values present in every list, from highest to lowest
+
+    Algorithm:
+    1. Pick the smallest list as driver, walk it from the end
+    2. For each candidate, gallop backward in every other list
+    3. Yield candidate if found in all lists
+
+    Work is proportional to the smaller list, times log of the gaps.
+
+    Args:
+        lists (list[Sequence[int]]): ascending sorted lists
+
+    Yields:
+        int: common values, DESC
+    """
+    if not lists:
+        return
+    lists = sorted(lists, key=len)
+    driver, others = lists[0], lists[1:]
+    his = [len(l) for l in others]
+    for i in range(len(driver) - 1, -1, -1):
+        x = driver[i]
+        found = True
+        for j, l in enumerate(others):
+            p = gallop_desc(l, x, his[j])
+            if p > 0 and l[p - 1] == x:
+                his[j] = p - 1
+            else:
+                # NOTE everything from p is > x, next candidates are < x
+                his[j] = p
+                found = False
+                break
+        if found:
+            yield x
+        elif min(his) == 0:
+            return
+
+
+def union_desc(iterables: list[Iterable[int]]) -> Iterator[int]:
+    """Yield values present in any iterable, from highest to lowest
+
+    Inputs are lazily merged, so stopping early only costs what was yielded.
+
+    Args:
+        iterables (list[Iterable[int]]): DESC sorted iterables, ie.
+            reversed(posting_list) or output of intersect_desc
+
+    Yields:
+        int: distinct values, DESC
+    """
+    last = None
+    for x in merge(*iterables, reverse=True):
+        if x != last:
+            yield x
+            last = x
@@ -0,0 +1,81 @@
+from contextlib import nullcontext
+from time import perf_counter
+
+_NULL_SPAN = nullcontext()
+
+
+class Spans:
+    """Named timing spans, switchable at runtime
+
+    Spans nest: time is accumulated per stack of span names, ie.
+    ("get_trending_topics", "sort"). When disabled, span() returns a
+    shared no-op context manager.
+
+    NOTE not thread-safe, enable it on single-threaded runs only.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.totals: dict[tuple[str, ...], float] = dict()
+        self._stack: list[str] = []
+
+    def span(self, name: str) -> "_Span | nullcontext":
+        """Time the enclosed block under $name
+
+        Args:
+            name (str): span name
+
+        Returns:
+            _Span | nullcontext: context manager
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def reset(self) -> None:
+        """Drop all recorded timings"""
+        self.totals.clear()
+        self._stack.clear()
+
+    def to_folded(self, root: str | None = None) -> str:
+        """Render self-time of each stack in folded format (flamegraph.pl)
+
+        Args:
+            root (str | None): keep only stacks starting with $root.
+                Defaults to None.
+
+        Returns:
+            str: one "a;b;c <microseconds>" line per stack
+        """
+        self_times = dict(self.totals)
+        for stack, seconds in self.totals.items():
+            parent = stack[:-1]
+            if parent in self_times:
+                self_times[parent] -= seconds
+        lines = []
+        for stack, seconds in self_times.items():
+            if root is not None and stack[0] != root:
+                continue
+            lines.append(f"{';'.join(stack)} {max(round(seconds * 1e6), 0)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class _Span:
+
+    __slots__ = ("_spans", "_name", "_start")
+
+    def __init__(self, spans: Spans, name: str):
+        self._spans = spans
+        self._name = name
+
+    def __enter__(self) -> "_Span":
+        self._spans._stack.append(self._name)
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = perf_counter() - self._start
+        stack = tuple(self._spans._stack)
+        self._spans._stack.pop()
+        totals = self._spans.totals
+        totals[stack] = totals.get(stack, 0.0) + elapsed
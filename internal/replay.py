@@ -0,0 +1,142 @@
+import threading
+from contextlib import nullcontext
+from queue import Queue
+from time import perf_counter, sleep
+from typing import Any, Iterable
+from yodelr import Yodelr, YodelrError
+from internal.metrics import LatencyHistogram
+
+_STOP = None
+
+
+class ReplayReport:
+    """Throughput and latency percentiles of a replay"""
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self):
+        self.histograms: dict[str, LatencyHistogram] = dict()
+        self.errors = 0
+        self.elapsed = 0.0
+
+    @property
+    def calls(self) -> int:
+        return sum(h.count for h in self.histograms.values())
+
+    @property
+    def throughput(self) -> float:
+        """Calls per second"""
+        return self.calls / self.elapsed if self.elapsed > 0 else 0.0
+
+    def merge(self, histograms: dict[str, LatencyHistogram], errors: int) -> None:
+        """Add observations of a client thread
+
+        Args:
+            histograms (dict[str, LatencyHistogram]): op -> latencies
+            errors (int): calls that raised YodelrError
+        """
+        for op, h in histograms.items():
+            self.histograms.setdefault(op, LatencyHistogram()).merge(h)
+        self.errors += errors
+
+    def __str__(self) -> str:
+        lines = [
+            f"calls={self.calls} errors={self.errors} "
+            f"elapsed={self.elapsed:.3f}s throughput={self.throughput:.1f}/s",
+            f"{'op':<24}{'count':>10}"
+            + "".join(f"{f'p{q}':>12}" for q in self.PERCENTILES),
+        ]
+        for op, h in sorted(self.histograms.items()):
+            lines.append(
+                f"{op:<24}{h.count:>10}"
+                + "".join(f"{h.percentile(q):>11.6f}s" for q in self.PERCENTILES)
+            )
+        return "\n".join(lines)
+
+
+def replay(
+    yodelr: Yodelr,
+    workload: Iterable[tuple[str, dict[str, Any]]],
+    qps: float | None = None,
+    threads: int = 1,
+    serialize: bool = True,
+) -> ReplayReport:
+    """Replay a workload of Yodelr calls on $yodelr with client threads
+
+    Algorithm:
+    1. Dispatcher (caller thread) streams calls into a bounded queue
+        - open-loop: call i is scheduled at start + i / $qps
+        - otherwise: as fast as client threads consume them
+    2. Each client thread runs calls and observes their latency
+        - open-loop: from scheduled time, so queueing delay is included
+        - otherwise: from dequeue time
+    3. Merge observations of client threads into a report
+
+    NOTE with several threads, calls may run out of log order, ie. a post
+    before its user. Such calls are counted as errors, as are calls
+    raising any other exception, ie. with wrong arguments.
+
+    Args:
+        yodelr (Yodelr): implementation under test
+        workload (Iterable[tuple[str, dict[str, Any]]]): op, kwargs
+        qps (float | None): target calls per second, None for as fast
+            as possible. Defaults to None.
+        threads (int): client threads. Defaults to 1.
+        serialize (bool): run one call at a time, for implementations that
+            are not thread-safe. Defaults to True.
+
+    Returns:
+        ReplayReport: report
+
+    Raises:
+        ValueError: if $qps or $threads is not positive
+    """
+    if qps is not None and not qps > 0:
+        raise ValueError(f"ERR: qps {qps} must be positive.")
+    if threads <= 0:
+        raise ValueError(f"ERR: threads {threads} must be positive.")
+    queue: Queue = Queue(maxsize=threads * 64)
+    lock = threading.Lock() if serialize else nullcontext()
+    report = ReplayReport()
+    report_lock = threading.Lock()
+
+    def client() -> None:
+        histograms: dict[str, LatencyHistogram] = dict()
+        errors = 0
+        while (item := queue.get()) is not _STOP:
+            scheduled, op, kwargs = item
+            start = perf_counter() if scheduled is None else scheduled
+            try:
+                with lock:
+                    getattr(yodelr, op)(**kwargs)
+            except YodelrError:
+                errors += 1
+            except Exception:
+                # NOTE a malformed call, ie. a misspelled kwarg, must not kill
+                # the client, else the dispatcher blocks on the full queue
+                errors += 1
+            h = histograms.get(op, None)
+            if h is None:
+                h = histograms[op] = LatencyHistogram()
+            h.observe(perf_counter() - start)
+        with report_lock:
+            report.merge(histograms, errors)
+
+    clients = [threading.Thread(target=client, daemon=True) for _ in range(threads)]
+    for t in clients:
+        t.start()
+    start = perf_counter()
+    for i, (op, kwargs) in enumerate(workload):
+        scheduled = None
+        if qps is not None:
+            scheduled = start + i / qps
+            delay = scheduled - perf_counter()
+            if delay > 0:
+                sleep(delay)
+        queue.put((scheduled, op, kwargs))
+    for _ in clients:
+        queue.put(_STOP)
+    for t in clients:
+        t.join()
+    report.elapsed = perf_counter() - start
+    return report
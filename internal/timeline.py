@@ -0,0 +1,107 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterator
+from internal.compaction import Compaction
+
+
+class Timeline:
+    """Post indices sorted by timestamp, many posts per timestamp
+
+    Two packed parallel arrays: timestamps ASC, and post indices at the same
+    position. Posts of a same timestamp keep their order of arrival.
+
+    Appending in timestamp order is O(1). A late post is inserted by
+    bisection, shifting only the entries more recent than itself, so the
+    cost of a late arrival is bounded by how late it is.
+
+    Entries are never deleted one by one, that would shift all entries
+    after them. Readers skip dead posts and compact() drops them in
+    bounded steps, swapping arrays once done.
+    """
+
+    __slots__ = ("timestamps", "inds", "_compaction")
+
+    def __init__(self):
+        self.timestamps: array[int] = array("q")
+        self.inds: array[int] = array("I")
+        self._compaction: Compaction | None = None
+
+    def __len__(self) -> int:
+        return len(self.inds)
+
+    def insert(self, timestamp: int, ind: int) -> None:
+        """Add post $ind at $timestamp, after posts of same timestamp
+
+        Args:
+            timestamp (int): timestamp
+            ind (int): post indice
+        """
+        i = bisect_right(self.timestamps, timestamp)
+        if i == len(self.timestamps):
+            self.timestamps.append(timestamp)
+            self.inds.append(ind)
+        else:
+            self.timestamps.insert(i, timestamp)
+            self.inds.insert(i, ind)
+            compaction = self._compaction
+            if compaction is not None and i < compaction.cursor:
+                # NOTE already copied part, insert in the copy as well
+                timestamps, inds = compaction.targets
+                j = bisect_right(timestamps, timestamp)
+                timestamps.insert(j, timestamp)
+                inds.insert(j, ind)
+                compaction.cursor += 1
+
+    @property
+    def compacting(self) -> bool:
+        """True if a compaction is in progress, see compact()"""
+        return self._compaction is not None
+
+    def compact(self, is_kept: Callable[[int], bool], max_entries: int) -> int:
+        """Drop post indices not kept, scanning at most $max_entries
+
+        A compaction is resumed on each call until it has scanned all
+        entries, then the compacted arrays replace the current ones.
+
+        Args:
+            is_kept (Callable[[int], bool]): post indice -> True to keep it
+            max_entries (int): bound of work
+
+        Returns:
+            int: entries scanned
+        """
+        if self._compaction is None:
+            self._compaction = Compaction(self.timestamps, self.inds)
+        scanned = self._compaction.step(is_kept, max_entries)
+        if self._compaction.done:
+            self.timestamps, self.inds = self._compaction.targets
+            self._compaction = None
+        return scanned
+
+    def span(self, from_timestamp: int, to_timestamp: int) -> tuple[int, int]:
+        """Positions of the timespan [from, to] in O(log n)
+
+        Args:
+            from_timestamp (int): oldest timestamp included
+            to_timestamp (int): latest timestamp included
+
+        Returns:
+            tuple[int, int]: lo, hi such that inds[lo:hi] are in timespan
+        """
+        lo = bisect_left(self.timestamps, from_timestamp)
+        hi = bisect_right(self.timestamps, to_timestamp, lo)
+        return lo, hi
+
+    def range(self, from_timestamp: int, to_timestamp: int) -> Iterator[int]:
+        """Yield post indices in timespan [from, to], oldest first
+
+        Args:
+            from_timestamp (int): oldest timestamp included
+            to_timestamp (int): latest timestamp included
+
+        Yields:
+            int: post indice
+        """
+        lo, hi = self.span(from_timestamp, to_timestamp)
+        for i in range(lo, hi):
+            yield self.inds[i]
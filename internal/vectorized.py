@@ -0,0 +1,85 @@
+from array import array
+import numpy as np
+
+# NOTE columns are array.array viewed without copy through the buffer
+# protocol. Views must be released before returning, as an array.array
+# cannot be resized while a view is alive.
+
+
+def _view(column: array) -> np.ndarray:
+    return np.frombuffer(column, dtype=np.dtype(column.typecode))
+
+
+def trending_topic_ids(
+    timeline_timestamps: array,
+    timeline_inds: array,
+    authors: array,
+    reaped: array,
+    deleted_users: set[int],
+    topic_ids: array,
+    topic_offsets: array,
+    names: list[str],
+    from_timestamp: int,
+    to_timestamp: int,
+    limit: int | None = None,
+) -> list[int]:
+    """Topic ids sorted by DESC count then ASC name, in a timespan
+
+    Algorithm:
+    1. searchsorted on timeline timestamps for the slice [from, to]
+    2. Drop posts reaped, and posts of deleted users with isin on their
+       author ids
+    3. Gather topic ids of the posts through per-post offsets
+    4. Count with bincount
+    5. If $limit, keep topics counting at least the $limit-th count
+       (argpartition), so ties at the cut are all kept
+    6. Sort the candidates left on (-count, name) in Python, cut to $limit
+
+    Args:
+        timeline_timestamps (array): timestamps ASC
+        timeline_inds (array): post indice of each timestamp
+        authors (array): post indice -> user id
+        reaped (array): post indice -> 1 if reaped, still in timeline until
+            compacted
+        deleted_users (set[int]): user ids whose posts are hidden
+        topic_ids (array): topic ids of all posts, flattened
+        topic_offsets (array): topic ids of post i are
+            topic_ids[topic_offsets[i]:topic_offsets[i+1]]
+        names (list[str]): topic id -> name
+        from_timestamp (int): oldest timestamp included
+        to_timestamp (int): latest timestamp included
+        limit (int | None): max number of topics. Defaults to None.
+
+    Returns:
+        list[int]: topic ids
+    """
+    timestamps = _view(timeline_timestamps)
+    lo = np.searchsorted(timestamps, from_timestamp, side="left")
+    hi = np.searchsorted(timestamps, to_timestamp, side="right")
+    inds = _view(timeline_inds)[lo:hi].astype(np.int64)
+    del timestamps
+    alive = _view(reaped)[inds] == 0
+    if deleted_users:
+        alive &= ~np.isin(
+            _view(authors)[inds], np.fromiter(deleted_users, dtype=np.int64)
+        )
+    inds = inds[alive]
+    offsets = _view(topic_offsets)
+    starts = offsets[inds]
+    lengths = offsets[inds + 1] - starts
+    del offsets
+    # NOTE positions of topic ids: start of each post repeated, plus 0..len-1
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    positions = np.arange(len(shifts), dtype=np.int64) + shifts
+    counts = np.bincount(_view(topic_ids)[positions])
+    candidates = np.flatnonzero(counts)
+    if limit is not None and 0 < limit < len(candidates):
+        kth = len(candidates) - limit
+        threshold = counts[candidates][np.argpartition(counts[candidates], kth)[kth]]
+        candidates = candidates[counts[candidates] >= threshold]
+    # NOTE names only compared among candidates, few once cut to $limit
+    trends = sorted(
+        zip(counts[candidates].tolist(), candidates.tolist()),
+        key=lambda tup: (-tup[0], names[tup[1]]),
+    )
+    return [topic_id for _, topic_id in trends[:limit]]
@@ -0,0 +1,41 @@
+import json
+from typing import Any, Iterator
+
+OPERATIONS = frozenset(
+    (
+        "add_user",
+        "add_post",
+        "delete_user",
+        "get_posts_for_user",
+        "get_posts_for_topic",
+        "get_posts_for_topics",
+        "get_trending_topics",
+    )
+)
+
+
+def read_workload(path: str) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Stream a JSONL workload, one Yodelr call per line
+
+    Format of a line: the method in "op", its keyword arguments aside, ie.
+        {"op": "add_post", "user_name": "u1", "post_text": "#hi", "timestamp": 1}
+
+    Args:
+        path (str): workload file
+
+    Raises:
+        ValueError: if a line has an unknown op
+
+    Yields:
+        tuple[str, dict[str, Any]]: op, kwargs
+    """
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            kwargs = json.loads(line)
+            op = kwargs.pop("op", None)
+            if op not in OPERATIONS:
+                raise ValueError(f"ERR: unknown op '{op}' at {path}:{lineno}.")
+            yield op, kwargs
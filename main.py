@@ -1,11 +1,138 @@
+import argparse
+import cProfile
 import logging
+import os
 from v1 import YodelrV1
+from yodelr import YodelrError
+from internal.export import write_csv
+from internal.replay import replay
+from internal.workload import read_workload
 
 logger = logging.getLogger(__name__)
 
-if __name__ == "__main__":
-    logger.info("--START YODELR--")
+
+def profile(args: argparse.Namespace) -> None:
+    """Replay a workload and dump a profile per phase, ie. per Yodelr method
+
+    Formats:
+        pstats: <out>/<method>.prof from cProfile, see `python -m pstats`
+        folded: <out>/<method>.folded from spans, see flamegraph.pl
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+    """
     yodelr = YodelrV1()
-    # TODO write your instruction below
+    spans = yodelr.enable_spans(args.format == "folded")
+    profilers: dict[str, cProfile.Profile] = dict()
+    for op, kwargs in read_workload(args.workload):
+        profiler = None
+        if args.format == "pstats":
+            profiler = profilers.get(op, None)
+            if profiler is None:
+                profiler = profilers[op] = cProfile.Profile()
+            profiler.enable()
+        try:
+            getattr(yodelr, op)(**kwargs)
+        except YodelrError as e:
+            logger.warning("> %s%s failed: %s", op, kwargs, e)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    os.makedirs(args.out, exist_ok=True)
+    if args.format == "pstats":
+        for op, profiler in profilers.items():
+            profiler.dump_stats(os.path.join(args.out, f"{op}.prof"))
+    else:
+        for op in {stack[0] for stack in spans.totals}:
+            with open(os.path.join(args.out, f"{op}.folded"), "w") as f:
+                f.write(spans.to_folded(root=op))
+    logger.info("Profiles written to '%s'", args.out)
+
+
+def replay_workload(args: argparse.Namespace) -> None:
+    """Replay a workload and print throughput and latency percentiles
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+    """
+    yodelr = YodelrV1()
+    report = replay(
+        yodelr, read_workload(args.workload), qps=args.qps, threads=args.threads
+    )
+    print(report)
+
+
+def export(args: argparse.Namespace) -> None:
+    """Export an index written by YodelrV1.dump() to CSV files
+
+    The index is unpickled, see YodelrV1.load(): it must be trusted.
 
-    logger.info("--END YODELR--")
+    Files: posts.csv, topics.csv and topic_counts.csv in <out>
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+    """
+    yodelr = YodelrV1.load(args.index)
+    os.makedirs(args.out, exist_ok=True)
+    rows = write_csv(os.path.join(args.out, "posts.csv"), yodelr.export_posts())
+    logger.info("> %s posts exported", rows)
+    write_csv(os.path.join(args.out, "topics.csv"), [yodelr.export_topics()])
+    rows = write_csv(
+        os.path.join(args.out, "topic_counts.csv"),
+        yodelr.export_topic_counts(args.bucket_size),
+    )
+    logger.info("> %s topic counts exported", rows)
+
+
+def positive_int(value: str) -> int:
+    """argparse type of a strictly positive integer"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """argparse type of a strictly positive float"""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Yodelr")
+    parser.add_argument("--log-level", default="WARNING")
+    commands = parser.add_subparsers(dest="command")
+    cmd = commands.add_parser("profile", help="profile each phase of a workload")
+    cmd.add_argument("workload", help="JSONL workload file")
+    cmd.add_argument("--out", default="profiles", help="output directory")
+    cmd.add_argument("--format", choices=("pstats", "folded"), default="pstats")
+    cmd.set_defaults(func=profile)
+    cmd = commands.add_parser("replay", help="replay a workload, report latencies")
+    cmd.add_argument("workload", help="JSONL workload file")
+    cmd.add_argument(
+        "--qps", type=positive_float, default=None, help="open-loop target"
+    )
+    cmd.add_argument("--threads", type=positive_int, default=1, help="client threads")
+    cmd.set_defaults(func=replay_workload)
+    cmd = commands.add_parser("export", help="export an index to CSV files")
+    cmd.add_argument(
+        "index", help="trusted index file written by YodelrV1.dump(), unpickled"
+    )
+    cmd.add_argument("--out", default="export", help="output directory")
+    cmd.add_argument("--bucket-size", type=positive_int, default=3600, help="timespan")
+    cmd.set_defaults(func=export)
+    return parser
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    if args.command is None:
+        parser.print_help()
+    else:
+        logger.info("--START YODELR--")
+        args.func(args)
+        logger.info("--END YODELR--")
@@ -0,0 +1,30 @@
+"""Unit tests of resumable compaction"""
+
+from array import array
+from internal.compaction import Compaction
+from internal.postings import PostingList
+
+
+def test_compaction_in_bounded_steps():
+    source = PostingList(range(10))
+    compaction = Compaction(source)
+    assert compaction.step(lambda ind: ind % 2 == 0, 3) == 3
+    assert not compaction.done
+    source.append(10)
+    source.append(11)
+    scanned = [compaction.step(lambda ind: ind % 2 == 0, 3) for _ in range(3)]
+    assert scanned == [3, 3, 3]
+    assert compaction.done
+    (target,) = compaction.targets
+    assert isinstance(target, PostingList)
+    assert list(target) == [0, 2, 4, 6, 8, 10]
+    assert list(source) == list(range(12))
+
+
+def test_compaction_of_parallel_arrays():
+    timestamps = array("q", [10, 20, 30])
+    inds = array("I", [0, 1, 2])
+    compaction = Compaction(timestamps, inds)
+    assert compaction.step(lambda ind: ind != 1, 10) == 3
+    assert compaction.done
+    assert [list(t) for t in compaction.targets] == [[10, 30], [0, 2]]
@@ -0,0 +1,31 @@
+"""Unit tests of export helpers"""
+
+import csv
+from array import array
+from internal.export import write_csv
+
+
+def test_write_csv_with_list_column(tmp_path):
+    path = tmp_path / "posts.csv"
+    batches = [
+        {
+            "post_id": array("I", [0, 1]),
+            "text": ["#a #b", "none"],
+            "topic_ids": array("i", [0, 1]),
+            "topic_ids_offsets": array("q", [0, 2, 2]),
+        },
+        {
+            "post_id": array("I", [2]),
+            "text": ["#b"],
+            "topic_ids": array("i", [1]),
+            "topic_ids_offsets": array("q", [0, 1]),
+        },
+    ]
+    assert write_csv(path, batches) == 3
+    with open(path, newline="") as f:
+        assert list(csv.reader(f)) == [
+            ["post_id", "text", "topic_ids"],
+            ["0", "#a #b", "0 1"],
+            ["1", "none", ""],
+            ["2", "#b", "1"],
+        ]
@@ -0,0 +1,37 @@
+"""Unit tests of metrics helpers"""
+
+from internal.metrics import LatencyHistogram, Metrics
+
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    assert h.percentile(50) == 0.0
+    for _ in range(98):
+        h.observe(1e-5)
+    h.observe(1e-2)
+    h.observe(1e-2)
+    assert 1e-5 <= h.percentile(50) < 2e-5
+    assert 1e-2 <= h.percentile(99) < 2e-2
+    assert h.count == 100
+
+
+def test_histogram_percentiles_within_sub_bucket():
+    h = LatencyHistogram()
+    for _ in range(90):
+        h.observe(2.6e-4)
+    for _ in range(10):
+        h.observe(3.9e-4)
+    assert 2.6e-4 <= h.percentile(50) < 2.6e-4 * 1.1
+    assert 3.9e-4 <= h.percentile(99) < 3.9e-4 * 1.1
+
+
+def test_prometheus_histogram_is_cumulative():
+    m = Metrics()
+    m.observe("op", 1e-6)
+    m.observe("op", 1.0)
+    text = m.to_prometheus({"posts": 3})
+    assert 'yodelr_call_seconds_bucket{method="op",le="1e-06"} 1' in text
+    assert 'yodelr_call_seconds_bucket{method="op",le="0.524288"} 1' in text
+    assert 'yodelr_call_seconds_bucket{method="op",le="+Inf"} 2' in text
+    assert text.count('yodelr_call_seconds_bucket{method="op"') == 33
+    assert "yodelr_posts 3" in text
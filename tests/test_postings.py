@@ -0,0 +1,49 @@
+"""Unit tests of posting list helpers"""
+
+import sys
+import pytest
+from internal.postings import PostingList, gallop_desc, intersect_desc, union_desc
+
+
+def test_posting_list_append():
+    pl = PostingList()
+    pl.append(1)
+    pl.append(4)
+    pl.append(4)
+    assert list(pl) == [1, 4]
+    assert list(reversed(pl)) == [4, 1]
+    with pytest.raises(ValueError):
+        pl.append(2)
+
+
+def test_posting_list_smaller_than_list():
+    values = list(range(1000, 101000))
+    assert sys.getsizeof(PostingList(values)) * 8 < sys.getsizeof(values) + sum(
+        map(sys.getsizeof, values)
+    )
+
+
+def test_gallop_desc():
+    l = [1, 3, 5, 7, 9, 11]
+    assert gallop_desc(l, 7, len(l)) == 4
+    assert gallop_desc(l, 8, len(l)) == 4
+    assert gallop_desc(l, 0, len(l)) == 0
+    assert gallop_desc(l, 12, len(l)) == len(l)
+    assert gallop_desc(l, 9, 3) == 3
+
+
+def test_intersect_desc():
+    a = PostingList(range(0, 100, 2))
+    b = PostingList(range(0, 100, 3))
+    c = [6, 12, 13, 66, 90]
+    assert list(intersect_desc([a, b])) == list(range(96, -1, -6))
+    assert list(intersect_desc([a, b, c])) == [90, 66, 12, 6]
+    assert list(intersect_desc([a, []])) == []
+    assert list(intersect_desc([])) == []
+
+
+def test_union_desc():
+    a = [1, 4, 6]
+    b = [2, 4, 5]
+    assert list(union_desc([reversed(a), reversed(b)])) == [6, 5, 4, 2, 1]
+    assert list(union_desc([])) == []
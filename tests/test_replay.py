@@ -0,0 +1,65 @@
+"""Unit tests of workload replay"""
+
+import json
+import pytest
+import v1
+from internal.replay import replay
+from internal.workload import read_workload
+
+
+@pytest.fixture
+def workload(user_name: str, sample_10_posts: list[str]) -> list[tuple[str, dict]]:
+    calls = [("add_user", {"user_name": user_name})]
+    for i, post in enumerate(sample_10_posts):
+        calls.append(
+            ("add_post", {"user_name": user_name, "post_text": post, "timestamp": i})
+        )
+    calls.append(("get_trending_topics", {"from_timestamp": 0, "to_timestamp": 9}))
+    calls.append(("delete_user", {"user_name": "unknown"}))
+    return calls
+
+
+def test_read_workload(tmp_path, workload: list[tuple[str, dict]]):
+    path = tmp_path / "workload.jsonl"
+    path.write_text("\n".join(json.dumps({"op": op, **kw}) for op, kw in workload))
+    assert list(read_workload(path)) == workload
+
+
+def test_read_workload_unknown_op(tmp_path):
+    path = tmp_path / "workload.jsonl"
+    path.write_text('{"op": "drop_everything"}')
+    with pytest.raises(ValueError):
+        list(read_workload(path))
+
+
+def test_replay_as_fast_as_possible(workload: list[tuple[str, dict]]):
+    yodelr = v1.YodelrV1()
+    report = replay(yodelr, workload, threads=1)
+    assert report.calls == len(workload)
+    assert report.errors == 1
+    assert report.histograms["add_post"].count == 10
+    assert yodelr.get_trending_topics(0, 9)[0] == "post"
+
+
+def test_replay_malformed_call(user_name: str):
+    calls = [("add_user", {"user_name": user_name})]
+    calls.append(("add_post", {"user_name": user_name, "text": "#a", "timestamp": 0}))
+    calls += [("get_trending_topics", {"from_timestamp": 0, "to_timestamp": 9})] * 500
+    report = replay(v1.YodelrV1(), calls, threads=1)
+    assert report.calls == len(calls)
+    assert report.errors == 1
+
+
+def test_replay_open_loop(workload: list[tuple[str, dict]]):
+    report = replay(v1.YodelrV1(), workload, qps=1000, threads=2)
+    assert report.calls == len(workload)
+    assert report.elapsed >= (len(workload) - 1) / 1000
+    assert "throughput" in str(report)
+
+
+@pytest.mark.parametrize("qps, threads", [(0, 1), (-5, 1), (None, 0)])
+def test_replay_invalid_pacing(
+    workload: list[tuple[str, dict]], qps: float | None, threads: int
+):
+    with pytest.raises(ValueError):
+        replay(v1.YodelrV1(), workload, qps=qps, threads=threads)
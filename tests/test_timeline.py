@@ -0,0 +1,35 @@
+"""Unit tests of timeline"""
+
+from internal.timeline import Timeline
+
+
+def test_timeline_keeps_posts_of_same_timestamp():
+    timeline = Timeline()
+    for ind, ts in enumerate([1, 2, 2, 2, 3]):
+        timeline.insert(ts, ind)
+    assert list(timeline.range(2, 2)) == [1, 2, 3]
+    assert timeline.span(0, 10) == (0, 5)
+
+
+def test_timeline_insert_late():
+    timeline = Timeline()
+    for ind, ts in enumerate([10, 20, 30, 15, 20]):
+        timeline.insert(ts, ind)
+    assert list(timeline.range(0, 100)) == [0, 3, 1, 4, 2]
+    assert list(timeline.range(11, 20)) == [3, 1, 4]
+
+
+def test_timeline_compact_in_steps():
+    timeline = Timeline()
+    for ind, ts in enumerate([1, 2, 2, 3, 4]):
+        timeline.insert(ts, ind)
+    assert timeline.compact(lambda ind: ind != 1, 2) == 2
+    assert timeline.compacting
+    assert len(timeline) == 5
+    timeline.insert(1, 5)
+    timeline.insert(4, 6)
+    assert timeline.compact(lambda ind: ind != 1, 2) == 2
+    assert timeline.compact(lambda ind: ind != 1, 2) == 2
+    assert not timeline.compacting
+    assert list(timeline.range(0, 5)) == [0, 5, 2, 3, 4, 6]
+    assert list(timeline.timestamps) == [1, 1, 2, 3, 4, 4]
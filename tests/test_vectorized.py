@@ -0,0 +1,59 @@
+"""Unit tests of vectorized trending topics against the pure-Python path"""
+
+import random
+import pytest
+from v1 import YodelrV1
+
+pytest.importorskip("numpy")
+
+TOPICS = ["#a", "#b", "#B", "#a_1", "#zz", "#Zz", "#m"]
+
+
+def _random_yodelr(seed: int) -> YodelrV1:
+    rand = random.Random(seed)
+    yodelr = YodelrV1()
+    users = [f"u{i}" for i in range(5)]
+    for user in users:
+        yodelr.add_user(user)
+    timestamp = 0
+    for _ in range(500):
+        timestamp += rand.randint(0, 2)
+        topics = rand.sample(TOPICS, rand.randint(0, 3))
+        text = " ".join(topics + rand.sample(topics, min(1, len(topics))))
+        yodelr.add_post(
+            rand.choice(users), text, max(0, timestamp - rand.randint(0, 5))
+        )
+    yodelr.delete_user("u0")
+    yodelr.reap(40)
+    yodelr.delete_user("u1")
+    return yodelr
+
+
+def _trending(yodelr: YodelrV1, vectorize: bool, *args, **kwargs) -> list[str]:
+    yodelr.VECTORIZE_MIN_POSTS = 0 if vectorize else float("inf")
+    return yodelr.get_trending_topics(*args, **kwargs)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_trending_topics_same_ordering(seed: int):
+    yodelr = _random_yodelr(seed)
+    for from_timestamp, to_timestamp in [(0, 1000), (10, 20), (100, 100), (5, 3)]:
+        assert _trending(yodelr, True, from_timestamp, to_timestamp) == _trending(
+            yodelr, False, from_timestamp, to_timestamp
+        )
+
+
+@pytest.mark.parametrize("limit", [0, 1, 2, 3, 10])
+def test_vectorized_trending_topics_limit_with_ties(limit: int):
+    yodelr = YodelrV1()
+    yodelr.add_user("u")
+    for i, text in enumerate(["#c #b", "#a #b", "#c #d", "#a"]):
+        yodelr.add_post("u", text, i)
+    assert _trending(yodelr, True, 0, 9, limit=limit) == ["a", "b", "c", "d"][:limit]
+
+
+def test_vectorized_trending_topics_then_add_post():
+    yodelr = _random_yodelr(0)
+    _trending(yodelr, True, 0, 1000)
+    yodelr.add_post("u2", "#new #a", 1000)
+    assert _trending(yodelr, True, 1000, 1000) == ["a", "new"]
@@ -6,6 +6,8 @@ Test all public methods of Yodelr including:
 - Edge cases
 """
 
+import pickle
+import sys
 import pytest
 import v1
 from yodelr import Yodelr, YodelrError
@@ -260,6 +262,16 @@ def test_get_trending_topics_oldest_to_latest(
     ]
 
 
+def test_get_trending_topics_limit(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[tuple[str, list]]
+):
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i)
+    assert yodelr.get_trending_topics(0, 9, limit=2) == ["post", "test"]
+    assert yodelr.get_trending_topics(0, 9, limit=0) == []
+
+
 def test_get_trending_topics_in_between_ts_count_focus(
     yodelr: Yodelr, user_name: str, sample_10_posts: list[tuple[str, list]]
 ):
@@ -302,3 +314,522 @@ def test_get_trending_topics_in_timespan_without_topic(
     for i in range(len(sample_10_posts)):
         yodelr.add_post(user_name, sample_10_posts[i], i)
     assert yodelr.get_trending_topics(TS_1, TS_2) == []
+
+
+def test_get_posts_for_topics_and(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i)
+    assert yodelr.get_posts_for_topics(["post", "test"]) == [sample_10_posts[2]]
+    assert yodelr.get_posts_for_topics(["post", "full"]) == []
+
+
+def test_get_posts_for_topics_or(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i)
+    assert yodelr.get_posts_for_topics(["first", "topic"], match_all=False) == [
+        sample_10_posts[8],
+        sample_10_posts[6],
+        sample_10_posts[0],
+    ]
+
+
+def test_get_posts_for_topics_with_limit(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i)
+    assert yodelr.get_posts_for_topics(["post"], limit=2) == [
+        sample_10_posts[6],
+        sample_10_posts[4],
+    ]
+
+
+def test_get_posts_for_topics_of_user(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post("u1" if i % 4 else user_name, sample_10_posts[i], i)
+    assert yodelr.get_posts_for_topics(["post"], user_name=user_name) == [
+        sample_10_posts[4]
+    ]
+    assert yodelr.get_posts_for_topics(
+        ["test", "topic"], user_name=user_name, match_all=False
+    ) == [sample_10_posts[8], sample_10_posts[0]]
+
+
+def test_get_posts_for_topics_of_unknown_user(yodelr: Yodelr, user_name: str):
+    with pytest.raises(YodelrError) as exc:
+        yodelr.get_posts_for_topics(["topic"], user_name=user_name)
+
+
+def test_get_posts_for_topics_skip_deleted_posts(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, sample_10_posts[0], 1)
+    yodelr.add_post("u1", sample_10_posts[2], 2)
+    yodelr.delete_user("u1")
+    assert yodelr.get_posts_for_topics(["test"]) == [sample_10_posts[0]]
+
+
+def test_get_posts_for_user_in_timespan(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i * 10)
+    assert yodelr.get_posts_for_user(user_name, 15, 40) == [
+        sample_10_posts[4],
+        sample_10_posts[3],
+        sample_10_posts[2],
+    ]
+    assert yodelr.get_posts_for_user(user_name, from_timestamp=75) == [
+        sample_10_posts[9],
+        sample_10_posts[8],
+    ]
+    assert yodelr.get_posts_for_user(user_name, to_timestamp=5) == [sample_10_posts[0]]
+    assert yodelr.get_posts_for_user(user_name, 91, 100) == []
+
+
+def test_get_posts_for_topic_in_timespan(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i * 10)
+    assert yodelr.get_posts_for_topic("post", 20, 40) == [
+        sample_10_posts[4],
+        sample_10_posts[2],
+    ]
+    assert yodelr.get_posts_for_topic("topic", from_timestamp=61) == [
+        sample_10_posts[8]
+    ]
+    assert yodelr.get_posts_for_topic("first", 10, 90) == []
+
+
+def test_get_posts_for_topic_skip_deleted_posts(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, sample_10_posts[0], 1)
+    yodelr.add_post("u1", sample_10_posts[2], 2)
+    yodelr.delete_user("u1")
+    assert yodelr.get_posts_for_topic("test") == [sample_10_posts[0]]
+
+
+def test_stats_without_metrics(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post("u1" if i % 2 else user_name, sample_10_posts[i], i)
+    yodelr.delete_user("u1")
+    stats = yodelr.stats()
+    assert stats["operations"] == {}
+    assert stats["gauges"]["posts"] == 5
+    assert stats["gauges"]["tombstones"] == 5
+    assert stats["gauges"]["topics"] == 5
+    assert stats["gauges"]["index_bytes"] > 0
+
+
+def test_stats_with_metrics(user_name: str, sample_10_posts: list[str]):
+    yodelr = v1.YodelrV1(metrics=True)
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i)
+    yodelr.get_trending_topics(0, 9)
+    with pytest.raises(YodelrError):
+        yodelr.get_posts_for_user("unknown")
+    operations = yodelr.stats()["operations"]
+    assert operations["add_post"]["count"] == len(sample_10_posts)
+    assert operations["get_trending_topics"]["count"] == 1
+    assert operations["get_posts_for_user"]["count"] == 1
+    assert (
+        0
+        < operations["add_post"]["p50_seconds"]
+        <= operations["add_post"]["p99_seconds"]
+    )
+    prometheus = yodelr.stats_prometheus()
+    assert 'yodelr_call_seconds_count{method="add_post"} 10' in prometheus
+    assert "yodelr_posts 10" in prometheus
+
+
+def test_spans_of_trending_topics(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, sample_10_posts[0], 1)
+    spans = yodelr.enable_spans()
+    yodelr.get_trending_topics(0, 9)
+    yodelr.enable_spans(False)
+    yodelr.get_posts_for_user(user_name)
+    assert set(spans.totals) == {
+        ("get_trending_topics",),
+        ("get_trending_topics", "timestamp_walk"),
+        ("get_trending_topics", "count"),
+        ("get_trending_topics", "sort"),
+    }
+    assert spans.to_folded().startswith("get_trending_topics")
+
+
+def test_delete_user_hides_posts_before_reap(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post("u1" if i % 2 else user_name, sample_10_posts[i], i)
+    yodelr.delete_user(user_name)
+    assert yodelr.stats()["gauges"]["reap_pending"] == 5
+    assert yodelr.get_posts_for_topic("post") == []
+    assert yodelr.get_posts_for_topics(["test", "full"], match_all=False) == []
+    assert yodelr.get_trending_topics(0, 9) == []
+    assert yodelr.get_posts_for_user("u1") == sample_10_posts[9::-2]
+
+
+def test_reap_is_bounded_and_cleans_index(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    yodelr.add_post("u1", sample_10_posts[6], 0)
+    for i in range(1, len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i)
+    yodelr.delete_user(user_name)
+    assert yodelr.reap(3) == 3
+    assert yodelr.stats()["gauges"]["reap_pending"] == 6
+    assert yodelr.reap() == 6
+    assert yodelr.reap() == 0
+    assert sorted(yodelr._test_get_all_topics()) == ["#post", "#topic"]
+    assert len(yodelr._timeline) == 1
+    assert yodelr.get_trending_topics(0, 9) == ["post", "topic"]
+
+
+def test_reap_compacts_topic_lists_lazily(yodelr: Yodelr, user_name: str):
+    yodelr.add_user("spam")
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, "#hot first", 0)
+    for i in range(1, 10):
+        yodelr.add_post("spam", "#hot buy", i)
+    yodelr.add_post(user_name, "#hot last", 10)
+    yodelr.delete_user("spam")
+    assert yodelr.reap(5) == 5
+    assert len(yodelr._inverted_composite_index["#hot"]) == 11
+    assert len(yodelr._timeline) == 11
+    assert yodelr.get_posts_for_topic("hot") == ["#hot last", "#hot first"]
+    while yodelr.reap(2) or yodelr._compactions or yodelr._timeline.compacting:
+        assert yodelr.get_posts_for_topic("hot") == ["#hot last", "#hot first"]
+    assert list(yodelr._inverted_composite_index["#hot"]) == [0, 10]
+    # NOTE at most half of timeline is dead once compacted
+    assert 2 <= len(yodelr._timeline) <= 2 * 2
+    assert yodelr.get_trending_topics(0, 10) == ["hot"]
+    assert yodelr.stats()["gauges"]["topics"] == 1
+
+
+def test_reap_work_is_bounded_per_step(yodelr: Yodelr, user_name: str):
+    yodelr.add_user("spam")
+    yodelr.add_user(user_name)
+    for i in range(200):
+        yodelr.add_post("spam" if i % 4 else user_name, "#hot #x", i)
+    yodelr.delete_user("spam")
+    compact = yodelr._compact
+    scanned = []
+    yodelr._compact = lambda max_entries: scanned.append(compact(max_entries))
+    for i in range(200, 300):
+        yodelr.add_post(user_name, f"#hot {i}", i)
+        assert scanned[-1] <= yodelr.REAP_STEP
+    assert sum(scanned) > yodelr.REAP_STEP
+    assert not yodelr._compactions and not yodelr._timeline.compacting
+    assert len(yodelr._inverted_composite_index["#hot"]) == 150
+    assert 150 <= len(yodelr._timeline) <= 2 * 150
+    assert len(yodelr.get_posts_for_topic("x")) == 50
+
+
+def test_add_post_reaps_deleted_users(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i)
+    yodelr.delete_user(user_name)
+    yodelr.add_post("u1", sample_10_posts[0], 10)
+    assert yodelr.stats()["gauges"]["reap_pending"] == 0
+    assert yodelr.get_posts_for_topic("test") == [sample_10_posts[0]]
+
+
+def test_add_user_again_after_delete(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, sample_10_posts[0], 1)
+    yodelr.delete_user(user_name)
+    yodelr.add_user(user_name)
+    assert yodelr.get_posts_for_user(user_name) == []
+    assert yodelr.get_posts_for_topic("test") == []
+    yodelr.add_post(user_name, sample_10_posts[2], 2)
+    assert yodelr.get_posts_for_topic("test") == [sample_10_posts[2]]
+
+
+def test_load_rejects_other_format(tmp_path, yodelr: Yodelr):
+    path = tmp_path / "yodelr.idx"
+    yodelr.dump(path)
+    v1.YodelrV1.load(path)
+    dump = pickle.loads(path.read_bytes())
+    path.write_bytes(pickle.dumps(dump["state"]))
+    with pytest.raises(ValueError):
+        v1.YodelrV1.load(path)
+    dump["format"] = v1.YodelrV1.DUMP_FORMAT + 1
+    path.write_bytes(pickle.dumps(dump))
+    with pytest.raises(ValueError):
+        v1.YodelrV1.load(path)
+    dump["format"] = v1.YodelrV1.DUMP_FORMAT
+    del dump["state"]["_timeline"]
+    path.write_bytes(pickle.dumps(dump))
+    with pytest.raises(ValueError):
+        v1.YodelrV1.load(path)
+
+
+def test_dump_and_load(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str], tmp_path
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post("u1" if i % 2 else user_name, sample_10_posts[i], i)
+    yodelr.delete_user("u1")
+    path = str(tmp_path / "yodelr.idx")
+    yodelr.dump(path)
+    loaded = v1.YodelrV1.load(path, metrics=True)
+    assert loaded.get_posts_for_user(user_name) == yodelr.get_posts_for_user(user_name)
+    assert loaded.get_trending_topics(0, 9) == yodelr.get_trending_topics(0, 9)
+    assert loaded.stats()["gauges"]["posts"] == yodelr.stats()["gauges"]["posts"]
+    assert loaded.stats()["gauges"]["reap_pending"] == 5
+    loaded.add_user("u1")
+    loaded.add_post("u1", sample_10_posts[6], 10)
+    assert loaded.get_posts_for_topic("topic") == [
+        sample_10_posts[6],
+        sample_10_posts[8],
+        sample_10_posts[6],
+    ]
+
+
+def test_memory_report(yodelr: Yodelr, user_name: str, sample_10_posts: list[str]):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post("u1" if i % 2 else user_name, sample_10_posts[i], i)
+    yodelr.delete_user("u1")
+    report = yodelr.memory_report(top_k=2)
+    for structure in ("posts", "users", "topics", "timestamps", "tombstones"):
+        assert report[structure] > 0
+    assert report["total"] == sum(
+        v for k, v in report.items() if k not in ("total", "top_topics")
+    )
+    assert len(report["top_topics"]) == 2
+    assert report["top_topics"][0][:2] == ("#post", 3)
+
+
+def test_memory_report_counts_each_user_once(yodelr: Yodelr):
+    yodelr.add_user("u1")
+    users = yodelr.memory_report()["users"]
+    name = "u" * 1000
+    yodelr.add_user(name)
+    assert yodelr.memory_report()["users"] - users < 2 * sys.getsizeof(name)
+
+
+def test_memory_report_posts_bytes_follow_reap(yodelr: Yodelr, user_name: str):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    posts = yodelr.memory_report()["posts"]
+    yodelr.add_post("u1", "u" * 100, 0)
+    yodelr.add_post(user_name, "a" * 100, 1)
+    assert yodelr.memory_report()["posts"] - posts >= 2 * sys.getsizeof("u" * 100)
+    yodelr.delete_user("u1")
+    yodelr.reap()
+    assert yodelr._posts_bytes == sys.getsizeof("a" * 100)
+
+
+def test_memory_report_user_name_like_topic(yodelr: Yodelr):
+    yodelr.add_user("#bob")
+    yodelr.add_post("#bob", "#x", 0)
+    report = yodelr.memory_report()
+    assert [topic for topic, _, _ in report["top_topics"]] == ["#x"]
+
+
+def test_memory_report_counts_topic_names(yodelr: Yodelr, user_name: str):
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, "#a", 0)
+    topics = yodelr.memory_report()["topics"]
+    topic = "#" + "t" * (yodelr.MAX_POST_CHARS - 1)
+    yodelr.add_post(user_name, topic, 1)
+    assert yodelr.memory_report()["topics"] - topics < 2 * sys.getsizeof(topic)
+    yodelr.delete_user(user_name)
+    yodelr.reap()
+    # NOTE topic left the index, its name stays in the topic id table
+    assert yodelr.memory_report()["topics"] > sys.getsizeof(topic)
+
+
+def test_add_posts_with_same_timestamp(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, sample_10_posts[2], 1)
+    yodelr.add_post(user_name, sample_10_posts[4], 1)
+    yodelr.add_post(user_name, sample_10_posts[6], 1)
+    assert yodelr.get_trending_topics(1, 1) == ["post", "test", "topic"]
+    assert yodelr.get_posts_for_topic("post", 1, 1) == [
+        sample_10_posts[6],
+        sample_10_posts[4],
+        sample_10_posts[2],
+    ]
+
+
+def test_add_post_out_of_order(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, sample_10_posts[0], 100)
+    yodelr.add_post(user_name, sample_10_posts[8], 150)
+    yodelr.add_post(user_name, sample_10_posts[2], 110)
+    assert yodelr.get_trending_topics(100, 120) == ["test", "first", "post"]
+    assert yodelr.get_trending_topics(111, 200) == ["full", "topic"]
+    assert yodelr.get_posts_for_user(user_name, 105, 120) == [sample_10_posts[2]]
+    assert yodelr.get_posts_for_user(user_name, to_timestamp=100) == [
+        sample_10_posts[0]
+    ]
+    assert yodelr.get_posts_for_topic("test", from_timestamp=101) == [
+        sample_10_posts[2]
+    ]
+
+
+def test_add_post_too_late(yodelr: Yodelr, user_name: str, sample_10_posts: list[str]):
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, sample_10_posts[0], 1000)
+    with pytest.raises(YodelrError) as exc:
+        yodelr.add_post(user_name, sample_10_posts[2], 999 - yodelr.MAX_REORDER_DELAY)
+    assert exc.value.error_code == YodelrError.LATE_POST
+    assert yodelr.get_posts_for_user(user_name) == [sample_10_posts[0]]
+
+
+@pytest.mark.parametrize("timestamp", [2**63, -(2**63) - 1, 1.5])
+def test_add_post_invalid_timestamp(yodelr: Yodelr, user_name: str, timestamp):
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, "#x first", 1)
+    with pytest.raises(YodelrError) as exc:
+        yodelr.add_post(user_name, "#x bad", timestamp)
+    assert exc.value.error_code == YodelrError.INVALID_TIMESTAMP
+    yodelr.add_post(user_name, "#x second", 2)
+    assert yodelr.get_posts_for_topic("x", 2, 2) == ["#x second"]
+    assert yodelr.stats()["gauges"]["posts"] == 2
+
+
+def test_high_water_kept_after_delete_user(yodelr: Yodelr):
+    yodelr.add_user("A")
+    yodelr.add_user("D")
+    yodelr.add_post("A", "a #x", 100)
+    yodelr.add_post("D", "d", 1000)
+    yodelr.add_post("A", "a late", 950)
+    yodelr.delete_user("D")
+    yodelr.reap()
+    yodelr.add_post("A", "a later", 900 + yodelr.MAX_REORDER_DELAY)
+    with pytest.raises(YodelrError) as exc:
+        yodelr.add_post("A", "a too late", 900)
+    assert exc.value.error_code == YodelrError.LATE_POST
+    assert yodelr.get_posts_for_user("A", to_timestamp=960) == [
+        "a later",
+        "a late",
+        "a #x",
+    ]
+
+
+def test_export_posts(yodelr: Yodelr, user_name: str, sample_10_posts: list[str]):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post("u1" if i % 2 else user_name, sample_10_posts[i], i)
+    yodelr.delete_user("u1")
+    batches = list(yodelr.export_posts(batch_size=4))
+    assert [list(b["post_id"]) for b in batches] == [[0, 2], [4, 6], [8]]
+    assert batches[0]["author"] == [user_name, user_name]
+    assert list(batches[1]["timestamp"]) == [4, 6]
+    assert batches[2]["text"] == [sample_10_posts[8]]
+    topics = yodelr.export_topics()["topic"]
+    first = batches[0]
+    assert [
+        [topics[t] for t in first["topic_ids"][o : first["topic_ids_offsets"][i + 1]]]
+        for i, o in enumerate(first["topic_ids_offsets"][:-1])
+    ] == [["first", "test"], ["post", "test"]]
+
+
+def test_export_posts_is_a_snapshot(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user("u1")
+    yodelr.add_user(user_name)
+    yodelr.add_post("u1", sample_10_posts[0], 1)
+    yodelr.add_post(user_name, sample_10_posts[2], 2)
+    batches = yodelr.export_posts(batch_size=1)
+    first = next(batches)
+    yodelr.delete_user("u1")
+    yodelr.add_post(user_name, sample_10_posts[4], 3)
+    assert yodelr.stats()["gauges"]["reap_pending"] == 1
+    assert [first["text"]] + [b["text"] for b in batches] == [
+        [sample_10_posts[0]],
+        [sample_10_posts[2]],
+    ]
+    yodelr.add_post(user_name, sample_10_posts[6], 4)
+    assert yodelr.stats()["gauges"]["reap_pending"] == 0
+
+
+def test_export_topic_counts(
+    yodelr: Yodelr, user_name: str, sample_10_posts: list[str]
+):
+    yodelr.add_user(user_name)
+    for i in range(len(sample_10_posts)):
+        yodelr.add_post(user_name, sample_10_posts[i], i)
+    topics = yodelr.export_topics()["topic"]
+    rows = [
+        (bucket, topics[topic_id], count)
+        for batch in yodelr.export_topic_counts(bucket_size=5, batch_size=2)
+        for bucket, topic_id, count in zip(
+            batch["bucket"], batch["topic_id"], batch["count"]
+        )
+    ]
+    assert rows == [
+        (0, "first", 1),
+        (0, "test", 2),
+        (0, "post", 2),
+        (5, "post", 1),
+        (5, "topic", 2),
+        (5, "full", 1),
+    ]
+
+
+@pytest.mark.parametrize("bucket_size", [0, -3])
+def test_export_topic_counts_invalid_bucket_size(yodelr: Yodelr, bucket_size: int):
+    with pytest.raises(ValueError):
+        next(yodelr.export_topic_counts(bucket_size))
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_export_invalid_batch_size(yodelr: Yodelr, user_name: str, batch_size: int):
+    yodelr.add_user(user_name)
+    yodelr.add_post(user_name, "#x", 0)
+    with pytest.raises(ValueError):
+        next(yodelr.export_posts(batch_size))
+    with pytest.raises(ValueError):
+        next(yodelr.export_topic_counts(10, batch_size))
+    assert yodelr._exports == 0
@@ -1,6 +1,8 @@
 import os
 import pytest
 import random
+import subprocess
+import sys
 import v1
 import logging
 import math
@@ -9,16 +11,25 @@ from lorem_text import lorem
 from yodelr import Yodelr
 
 ENV_PERF_SIZE = os.getenv("PERF_GENERATOR_SIZE")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_QUERY_SCRIPT = """
+from time import perf_counter
+start = perf_counter()
+from v1 import YodelrV1
+yodelr = YodelrV1.load({path!r})
+yodelr.get_trending_topics(0, {to_timestamp})
+print(perf_counter() - start)
+"""
 
 
 def random_post_generator(words: int) -> str:
-    post = ""
-    for i in range(words):
-        w = lorem.words(1)
+    # NOTE a single lorem call, 1 word in 3 turned into a topic
+    corpus = lorem.words(words).split()
+    for i in range(len(corpus)):
         if random.randint(1, 6) in [2, 3]:
-            w = "#" + w
-        post += w + " "
-    return post
+            corpus[i] = "#" + corpus[i]
+    return " ".join(corpus) + " "
 
 
 @pytest.fixture
@@ -111,3 +122,38 @@ def test_perf_add_post_and_all_getters_with_multi_users(
     for topic in yodelr._test_get_all_topics():
         yodelr.get_trending_topics(0, len(random_post_generator_words) - 1)
     logging.warning("Time in seconds 'get_trending_topics': %s", time() - elapsed)
+
+
+def test_perf_import_to_first_query(
+    tmp_path, user_names: list[str], random_post_generator_words: str
+):
+    yodelr = v1.YodelrV1()
+    for u in user_names:
+        yodelr.add_user(u)
+    m = 0
+    while yodelr.MAX_POST_CHARS * m < len(random_post_generator_words):
+        user = user_names[random.randint(0, len(user_names) - 1)]
+        yodelr.add_post(
+            user,
+            random_post_generator_words[
+                yodelr.MAX_POST_CHARS * m : (m + 1) * yodelr.MAX_POST_CHARS
+            ],
+            m,
+        )
+        m += 1
+    path = str(tmp_path / "yodelr.idx")
+    elapsed = time()
+    yodelr.dump(path)
+    logging.warning("Time in seconds 'dump': %s", time() - elapsed)
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            FIRST_QUERY_SCRIPT.format(path=path, to_timestamp=m),
+        ],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    logging.warning("Time in seconds 'import to first query': %s", float(result.stdout))
@@ -1,18 +1,38 @@
+import heapq
 import logging
 import re
-from typing import Any, List
+import sys
+from array import array
+from collections import deque
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from functools import cache
+from itertools import islice
 from yodelr import Yodelr, YodelrError
-from internal.wrapper import FIFOWrapper, LIFOWrapper
+from internal.metrics import Metrics, timed
+from internal.profiling import Spans
+from internal.postings import PostingList, intersect_desc, union_desc
+from internal.timeline import Timeline
+from internal.compaction import Compaction
 
 type Timestamp = int
 type Topic = str
 type Post = str
 type User = str
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _import_vectorized():
+    """Import internal.vectorized on first use, None if NumPy is missing"""
+    try:
+        from internal import vectorized
+    except ImportError:
+        return None
+    return vectorized
+
+
 class YodelrV1(Yodelr):
 
     ID_POST: str = "post_text"
@@ -20,25 +40,73 @@ class YodelrV1(Yodelr):
     ID_USER: str = "author"
     REGEX_TOPIC = r"#([0-9a-zA-Z_]+)"
     MAX_POST_CHARS = 140
-
-    def __init__(self):
+    REAP_STEP = 64
+    MAX_REORDER_DELAY = 60
+    # NOTE bounds of signed 64-bit timestamps packed in array("q")
+    MIN_TIMESTAMP = -(2**63)
+    MAX_TIMESTAMP = 2**63 - 1
+    TRANSIENT_ATTRIBUTES = ("_metrics", "_spans", "_exports")
+    EXPORT_BATCH_SIZE = 10_000
+    # NOTE bump on any change of the attributes serialized by dump()
+    DUMP_FORMAT = 2
+    VECTORIZE_MIN_POSTS = 10_000
+
+    def __init__(self, metrics: bool = False):
         """Initialise a composite inverted index and list of posts
 
-        Keep track of post deleted for future improvement using
-        clean-on-threshold algorithn #v3
+        Timestamp of each post is kept aside, at the same indice, with its
+        high-water mark, ie. latest timestamp seen when it was added, which
+        increases monotonically to bisect posting lists by timespan. It is
+        kept in $_high_water, never lowered by deletions.
+
+        Timeline orders post indices by timestamp, with many posts per
+        timestamp and posts arriving up to $MAX_REORDER_DELAY late. Reaped
+        posts are flagged in $_post_reaped and left in timeline and topic
+        lists until compacted, see reap().
+
+        Author of each post is kept aside as well, as an user id, so a
+        deleted user hides its posts in O(1): readers skip posts of users
+        in $_deleted_users until the reaper cleans them up, see reap().
+
+        Topic ids of each post are kept as a flat column with per-post
+        offsets, so aggregations read ids instead of parsing texts again.
 
         Composite inverted index:
-            Topic:      List[int]
-            User:       List[int]
-            Timestamp:  int
+            Topic:      PostingList
+            User:       PostingList
+
+        Args:
+            metrics (bool): record latency of API calls, see stats().
+                Defaults to False.
         """
         super().__init__()
         self._posts: list[Post] = []
-        self._inverted_composite_index: dict[
-            Topic | Timestamp | User, List[int] | int
-        ] = dict()
+        self._posts_bytes = 0
+        self._timestamps: array[Timestamp] = array("q")
+        self._high_waters: array[Timestamp] = array("q")
+        self._high_water: Timestamp | None = None
+        self._timeline = Timeline()
+        self._reaped = 0
+        self._inverted_composite_index: dict[Topic | User, PostingList] = dict()
+        self._authors: array[int] = array("I")
+        self._post_reaped: array[int] = array("B")
+        self._user_ids: dict[User, int] = dict()
+        self._user_names: list[User] = []
+        self._deleted_users: set[int] = set()
+        self._reap_queue: deque[tuple[int, PostingList]] = deque()
+        self._topic_live: array[int] = array("I")
+        self._compactions: dict[Topic, Compaction] = dict()
+        self._topic_ids: dict[Topic, int] = dict()
+        self._topic_names: list[Topic] = []
+        self._post_topic_ids: array[int] = array("i")
+        self._post_topic_offsets: array[int] = array("q", [0])
         self._post_deleted = 0
+        self._topics = 0
+        self._metrics: Metrics | None = Metrics() if metrics else None
+        self._spans = Spans()
+        self._exports = 0
 
+    @timed
     def add_user(self, user_name: str) -> None:
         """Add user to the system.
 
@@ -46,9 +114,12 @@ class YodelrV1(Yodelr):
             user_name (str): user_name
         """
         logger.info("Adding user %s ...", user_name)
-        self._inverted_composite_index[user_name] = []
+        self._inverted_composite_index[user_name] = PostingList()
+        self._user_ids[user_name] = len(self._user_names)
+        self._user_names.append(user_name)
         logger.debug("updated Yodelr: %s", self)
 
+    @timed
     def add_post(self, user_name: str, post_text: str, timestamp: int) -> None:
         """Add post to system
 
@@ -58,40 +129,85 @@ class YodelrV1(Yodelr):
         A topic found in post is case sensitive, therefore
         topic '#hello' is different than '#Hello'
 
+        Posts may share a timestamp and may arrive out of order, as long as
+        they are at most $MAX_REORDER_DELAY older than the latest one.
+
         Algorithm:
         1. Extract topics from post
         2. Add post to posts
-        3. Add indice of post in its list in inverted index timestamp
+        3. Insert indice of post in timeline at its timestamp
         3. Add indice of post in its list in inverted index user
         3. Add indice of post in its list in inverted index topic
+        4. Reap up to $REAP_STEP posts of deleted users, if any
 
         Args:
             user_name (str): user
             post_text (str): post
             timestamp (int): timestamp
+
+        Raises:
+            YodelrError: UNKNOWN_USER, INVALID_TIMESTAMP if not an int in
+                [$MIN_TIMESTAMP, $MAX_TIMESTAMP], or LATE_POST if beyond
+                reorder delay
         """
         logger.info("Add post...")
         if not self._is_user_in_system(user_name):
             raise YodelrError(YodelrError.UNKNOWN_USER)
+        # NOTE checked first, a packed array would raise halfway through indexing
+        if (
+            not isinstance(timestamp, int)
+            or not self.MIN_TIMESTAMP <= timestamp <= self.MAX_TIMESTAMP
+        ):
+            raise YodelrError(YodelrError.INVALID_TIMESTAMP, f"{timestamp!r}")
+        high_water = self._high_water
+        if high_water is None or timestamp > high_water:
+            high_water = timestamp
+        elif timestamp < high_water - self.MAX_REORDER_DELAY:
+            raise YodelrError(
+                YodelrError.LATE_POST, f"{timestamp} older than {high_water}"
+            )
         ind = len(self._posts)
         post_text = post_text[: self.MAX_POST_CHARS]
-        topics = self._extract_topics(post_text)
-        self._posts.append(post_text)
-        self._inverted_composite_index[str(timestamp)] = ind
-        self._inverted_composite_index[user_name].append(ind)
-        for topic in topics:
-            # NOTE no duplicate for topic
-            if ind not in self._inverted_composite_index.get(topic, []):
-                self._inverted_composite_index.setdefault(topic, []).append(ind)
+        with self._spans.span("extract_topics"):
+            topics = self._extract_topics(post_text)
+        with self._spans.span("index"):
+            self._posts.append(post_text)
+            self._posts_bytes += sys.getsizeof(post_text)
+            self._timestamps.append(timestamp)
+            self._high_waters.append(high_water)
+            self._high_water = high_water
+            self._authors.append(self._user_ids[user_name])
+            self._post_reaped.append(0)
+            self._timeline.insert(timestamp, ind)
+            self._inverted_composite_index[user_name].append(ind)
+            for topic in topics:
+                # NOTE no duplicate for topic, PostingList ignores same last indice
+                topic_inds = self._inverted_composite_index.get(topic, None)
+                if topic_inds is None:
+                    topic_inds = self._inverted_composite_index[topic] = PostingList()
+                    self._topics += 1
+                topic_id = self._topic_ids.get(topic, None)
+                if topic_id is None:
+                    topic_id = self._topic_ids[topic] = len(self._topic_names)
+                    self._topic_names.append(topic)
+                    self._topic_live.append(0)
+                self._topic_live[topic_id] += 1
+                self._post_topic_ids.append(topic_id)
+                topic_inds.append(ind)
+            self._post_topic_offsets.append(len(self._post_topic_ids))
+        if self._reap_queue or self._compactions or self._timeline.compacting:
+            self.reap(self.REAP_STEP)
         logger.debug("> updated Yodelr: %s", self)
 
+    @timed
     def delete_user(self, user_name: str) -> None:
-        """Delete user and all its posts
+        """Delete user and all its posts in O(1)
 
         Algorithm:
         1. Get indices from inverted index user
         2. Delete user from inverted index
-        3. For each indice, replace post with None to mark as deleted
+        3. Mark user id as deleted, readers skip its posts from now on
+        4. Enqueue its indices to the reaper, see reap()
 
         Args:
             user_name (str): user
@@ -103,80 +219,219 @@ class YodelrV1(Yodelr):
         logger.debug("> indices of user '%s': %s", user_name, user_inds)
         logger.debug("> delete user '%s' from inverted composite index", user_name)
         del self._inverted_composite_index[user_name]
-        for ind in user_inds:
-            # NOTE mark as removed - policy to speed up
-            self._posts[ind] = None
-            self._post_deleted += 1
-        # NOTE shift all post to left to downsize posts and free space
-        # TODO v3 - implement clean-on-threshold to free space on self._posts
-
-    def get_posts_for_user(self, user_name: str) -> List[str]:
+        with self._spans.span("mark_deleted"):
+            user_id = self._user_ids.pop(user_name)
+            self._deleted_users.add(user_id)
+            self._reap_queue.append((user_id, user_inds))
+            self._post_deleted += len(user_inds)
+        # TODO v3 - slots of reaped posts stay in self._posts as None, reuse
+        # them or shift posts once tombstones pass a threshold
+
+    @timed
+    def reap(self, max_posts: int = REAP_STEP) -> int:
+        """Clean up posts of deleted users, at most $max_posts of them
+
+        Called on each add_post while there is work left, and can be called
+        from a maintenance loop to catch up faster. Paused while an export
+        is in progress, to keep its snapshot consistent.
+
+        Removal from topic lists and timeline is lazy, readers already skip
+        dead posts: once more than half of one is dead, it is compacted by
+        a resumable copy, see internal.compaction. A step reaps at most
+        $max_posts posts then scans at most $max_posts entries to compact,
+        so its work is bounded whatever the size of topics and timeline.
+
+        Algorithm:
+        1. Pop latest indice of the oldest deleted user
+        2. Replace post with None and flag it as reaped
+        3. Decrement live posts of its topics, dropping topics with none
+           left and queuing compaction of those more than half dead
+        4. Once user has no indice left, forget it from deleted users
+        5. Repeat until $max_posts is reached or nothing is left
+        6. Compact timeline, then queued topics, up to $max_posts entries
+
+        Args:
+            max_posts (int): bound of work. Defaults to $REAP_STEP.
+
+        Returns:
+            int: posts reaped
+        """
+        reaped = 0
+        if self._exports:
+            return reaped
+        while self._reap_queue and reaped < max_posts:
+            user_id, user_inds = self._reap_queue[0]
+            while user_inds and reaped < max_posts:
+                ind = user_inds.pop()
+                self._posts_bytes -= sys.getsizeof(self._posts[ind])
+                self._posts[ind] = None
+                self._post_reaped[ind] = 1
+                for topic_id in self._get_post_topic_ids(ind):
+                    self._topic_live[topic_id] -= 1
+                    live = self._topic_live[topic_id]
+                    topic = self._topic_names[topic_id]
+                    if live == 0:
+                        del self._inverted_composite_index[topic]
+                        self._compactions.pop(topic, None)
+                        self._topics -= 1
+                    elif topic not in self._compactions:
+                        topic_inds = self._inverted_composite_index[topic]
+                        if (len(topic_inds) - live) * 2 > len(topic_inds):
+                            self._compactions[topic] = Compaction(topic_inds)
+                reaped += 1
+            if not user_inds:
+                self._reap_queue.popleft()
+                self._deleted_users.discard(user_id)
+        self._reaped += reaped
+        self._compact(max_posts)
+        logger.debug("> reaped %s posts", reaped)
+        return reaped
+
+    @timed
+    def get_posts_for_user(
+        self,
+        user_name: str,
+        from_timestamp: int | None = None,
+        to_timestamp: int | None = None,
+    ) -> list[str]:
         """Get list of post from a user
 
         Args:
             user_name (str): user
+            from_timestamp (int | None): oldest timestamp included. Defaults to None.
+            to_timestamp (int | None): latest timestamp included. Defaults to None.
 
         Algorithm:
         1. Get indices from inverted index user
-        2. For each indices, enqueue post to posts
-        3. Return posts
+        2. Bisect indices to the timespan [from, to]
+        3. For each indice in timespan, latest first, add post to posts
+        4. Return posts
 
         Returns:
-            List[str]: posts
+            list[str]: posts
         """
         logger.info("Get posts for user '%s'...", user_name)
-        posts: list = []
         user_inds = self._inverted_composite_index.get(user_name, None)
         if user_inds is None:
             raise YodelrError(YodelrError.UNKNOWN_USER)
         logger.debug("> indices of user '%s': %s", user_name, user_inds)
-        for ind in user_inds:
-            FIFOWrapper.add(posts, self._posts[ind])  # latest at ind=0
-        logger.debug("> updated Yodelr: %s", self)
-        return posts
-
-    def get_posts_for_topic(self, topic: str) -> List[str]:
+        return self._get_posts_in_timespan(user_inds, from_timestamp, to_timestamp)
+
+    @timed
+    def get_posts_for_topic(
+        self,
+        topic: str,
+        from_timestamp: int | None = None,
+        to_timestamp: int | None = None,
+    ) -> list[str]:
         """Get all posts of a topic
 
         Algorithm:
         1. Get indices from inverted index topic
-        2. For each indices, enqueue post to posts
-        3. Return posts
+        2. Bisect indices to the timespan [from, to]
+        3. For each indice in timespan, latest first, add post to posts
+        4. Return posts
 
 
         Args:
             topic (str): topic
+            from_timestamp (int | None): oldest timestamp included. Defaults to None.
+            to_timestamp (int | None): latest timestamp included. Defaults to None.
 
         Returns:
-            List[str]: posts
+            list[str]: posts
         """
-        logging.info("Get posts for topic...")
-        posts = []
+        logger.info("Get posts for topic...")
         topic_inds = self._inverted_composite_index.get(f"#{topic}", [])
         logger.debug("> indices of topic '%s': %s", topic, topic_inds)
-        for ind in topic_inds:
-            FIFOWrapper.add(posts, self._posts[ind])
-        return posts
+        return self._get_posts_in_timespan(topic_inds, from_timestamp, to_timestamp)
+
+    @timed
+    def get_posts_for_topics(
+        self,
+        topics: list[str],
+        user_name: str | None = None,
+        match_all: bool = True,
+        limit: int | None = None,
+    ) -> list[str]:
+        """Get posts matching a boolean query over topics, optionally by a user
+
+        Examples:
+            #a AND #b:          get_posts_for_topics(["a", "b"])
+            #a OR #b:           get_posts_for_topics(["a", "b"], match_all=False)
+            user X with #t:     get_posts_for_topics(["t"], user_name="X")
 
-    def get_trending_topics(self, from_timestamp: int, to_timestamp: int) -> List[str]:
+        Algorithm:
+        1. Get indices from inverted index for each topic (and user)
+        2. If match_all, galloping intersection driven by the smallest list
+        3. Else, lazy DESC merge of topic lists, each intersected with user
+        4. Skip deleted posts, stop at $limit
+        5. Return posts, latest first
+
+        Args:
+            topics (list[str]): topics, without '#'
+            user_name (str | None): restrict to posts of user. Defaults to None.
+            match_all (bool): AND if True, OR otherwise. Defaults to True.
+            limit (int | None): max number of posts. Defaults to None.
+
+        Returns:
+            list[str]: posts
+        """
+        logger.info(
+            "Get posts for topics=%s user='%s' match_all=%s...",
+            topics,
+            user_name,
+            match_all,
+        )
+        user_inds = None
+        if user_name is not None:
+            user_inds = self._inverted_composite_index.get(user_name, None)
+            if user_inds is None:
+                raise YodelrError(YodelrError.UNKNOWN_USER)
+        topics_inds = [
+            self._inverted_composite_index.get(f"#{topic}", []) for topic in topics
+        ]
+        if match_all:
+            if user_inds is not None:
+                topics_inds.append(user_inds)
+            inds = intersect_desc(topics_inds)
+        elif user_inds is not None:
+            inds = union_desc(
+                [intersect_desc([topic_inds, user_inds]) for topic_inds in topics_inds]
+            )
+        else:
+            inds = union_desc([reversed(topic_inds) for topic_inds in topics_inds])
+        posts = (self._posts[ind] for ind in inds if self._is_post_alive(ind))
+        return list(islice(posts, limit))
+
+    @timed
+    def get_trending_topics(
+        self, from_timestamp: int, to_timestamp: int, limit: int | None = None
+    ) -> list[str]:
         """Get topics trending in a specific timespan
 
         Algorithm:
-        1. For each timestamp between from and to
-        2. Get indice from inverted index timestamp
-        3. If there is a post then
-            4.  Extract topics from post
-            5.  Count total topic in all post for each topic
-            6.  Create trends by using topic and its count
-            7.  Sort trends primarily by DESC count then ASC alphabetically
-        8. Return trends
+        1. Bisect timeline to the timespan [from, to], O(log n)
+        2. For each indice in timespan
+        3. If post is not deleted, keep its indice
+        4. Count each topic id of posts kept
+        5. Create trends by using topic and its count
+        6. Sort trends primarily by DESC count then ASC alphabetically
+        7. Return trends, at most $limit of them
+
+        A timespan of at least $VECTORIZE_MIN_POSTS posts is aggregated with
+        NumPy if installed, see internal.vectorized, with the same ordering.
+
+        Each step runs in its own span, see enable_spans().
 
         Args:
             from_timestamp (int): start trends period
             to_timestamp (int): end trends period
+            limit (int | None): max number of topics, None for all.
+                Defaults to None.
 
         Returns:
-            List[str]: topics
+            list[str]: topics
         """
         # NOTE no exception, permutation to fix
         if from_timestamp > to_timestamp:
@@ -184,31 +439,474 @@ class YodelrV1(Yodelr):
         logger.info(
             "Get trending topics from=%s to=%s...", from_timestamp, to_timestamp
         )
-        trends = []
-        topics = dict()
-        logger.debug("> 1st pass topics=%s", topics)
-        # TODO v3 - implement binary search for closest timestamp
-        for ts in range(from_timestamp, to_timestamp + 1):
-            ind = self._inverted_composite_index.get(str(ts), None)
-            if ind is not None and self._posts[ind] is not None:
-                tps = self._extract_topics(self._posts[ind])
-                for topic in tps:
-                    topic = topic.lstrip("#")
-                    if topic not in topics:
-                        topics[topic] = 1
-                    else:
-                        topics[topic] += 1
-        logger.debug("> 2nd pass topics with count=%s", topics)
-        trends = []
-        for topic, count in topics.items():
-            trends.append((count, topic))
-            logger.debug(">> trends=%s", trends)
-        # NOTE sorting: desc on count, alpha asc on topic
-        trends.sort(key=lambda tup: (-tup[0], tup[1]))
-        trends = [trend[1] for trend in trends]
-        logger.debug("> 3rd pass trends=%s", trends)
+        lo, hi = self._timeline.span(from_timestamp, to_timestamp)
+        vectorized = (
+            _import_vectorized() if hi - lo >= self.VECTORIZE_MIN_POSTS else None
+        )
+        if vectorized is not None:
+            with self._spans.span("vectorized"):
+                topic_ids = vectorized.trending_topic_ids(
+                    self._timeline.timestamps,
+                    self._timeline.inds,
+                    self._authors,
+                    self._post_reaped,
+                    self._deleted_users,
+                    self._post_topic_ids,
+                    self._post_topic_offsets,
+                    self._topic_names,
+                    from_timestamp,
+                    to_timestamp,
+                    limit,
+                )
+            return [self._topic_names[topic_id].lstrip("#") for topic_id in topic_ids]
+        with self._spans.span("timestamp_walk"):
+            inds = [
+                ind for ind in self._timeline.inds[lo:hi] if self._is_post_alive(ind)
+            ]
+        with self._spans.span("count"):
+            counts: dict[int, int] = dict()
+            for ind in inds:
+                for topic_id in self._get_post_topic_ids(ind):
+                    counts[topic_id] = counts.get(topic_id, 0) + 1
+        logger.debug("> topic ids with count=%s", counts)
+        with self._spans.span("sort"):
+            trends = [
+                (count, self._topic_names[topic_id].lstrip("#"))
+                for topic_id, count in counts.items()
+            ]
+            # NOTE sorting: desc on count, alpha asc on topic
+            trends.sort(key=lambda tup: (-tup[0], tup[1]))
+            trends = [trend[1] for trend in trends[:limit]]
+        logger.debug("> trends=%s", trends)
         return trends
 
+    def stats(self) -> dict[str, dict]:
+        """Get metrics of API calls and gauges of the system
+
+        Operations are only recorded if Yodelr was created with metrics=True.
+        Gauges are computed on call, index_bytes in O(keys of the index).
+
+        Returns:
+            dict[str, dict]: {
+                "operations": {method: {count, total_seconds, p50_seconds, p99_seconds}},
+                "gauges": {posts, tombstones, topics, reap_pending, index_bytes},
+            }
+        """
+        return {
+            "operations": {} if self._metrics is None else self._metrics.snapshot(),
+            "gauges": self._gauges(),
+        }
+
+    def stats_prometheus(self) -> str:
+        """Get stats() in Prometheus text exposition format
+
+        Returns:
+            str: metrics
+        """
+        metrics = Metrics() if self._metrics is None else self._metrics
+        return metrics.to_prometheus(self._gauges())
+
+    def memory_report(self, top_k: int = 10) -> dict[str, int | list]:
+        """Get deep memory footprint in bytes of each structure
+
+        Bytes of post texts are kept up to date by add_post and reap, so a
+        report is one pass over keys of the composite inverted index, user
+        names and topic names, ie. O(keys), whatever the number of posts.
+
+        Structures:
+            posts:      post texts, their timestamps, high-water marks, authors
+                        and topic ids
+            users:      user keys and posting lists, user ids and names
+            topics:     topic keys and posting lists, topic ids and names
+            timestamps: timeline of post indices by timestamp
+            tombstones: deleted users, posting lists pending reap and topic
+                        lists being compacted
+            index:      hash table of the composite inverted index
+
+        Args:
+            top_k (int): number of largest topics to detail. Defaults to 10.
+
+        Returns:
+            dict[str, int | list]: bytes per structure, "total", and
+                "top_topics" as [(topic, entries, bytes)] by DESC entries
+        """
+        sizeof = sys.getsizeof
+        report = {
+            "posts": sizeof(self._posts)
+            + self._posts_bytes
+            + sizeof(self._timestamps)
+            + sizeof(self._high_waters)
+            + sizeof(self._authors)
+            + sizeof(self._post_reaped)
+            + sizeof(self._post_topic_ids)
+            + sizeof(self._post_topic_offsets),
+            "users": sizeof(self._user_ids)
+            + sizeof(self._user_names)
+            + sum(map(sizeof, self._user_names)),
+            "topics": sizeof(self._topic_ids)
+            + sizeof(self._topic_live)
+            + sizeof(self._topic_names)
+            + sum(map(sizeof, self._topic_names)),
+            "timestamps": sizeof(self._timeline)
+            + sizeof(self._timeline.timestamps)
+            + sizeof(self._timeline.inds),
+            "tombstones": sizeof(self._deleted_users)
+            + sizeof(self._reap_queue)
+            + sizeof(self._compactions)
+            + sum(sizeof(c.targets[0]) for c in self._compactions.values())
+            + sum(sizeof(inds) for _, inds in self._reap_queue),
+            "index": sizeof(self._inverted_composite_index),
+        }
+        topics = []
+        for key, value in self._inverted_composite_index.items():
+            if key in self._user_ids:
+                # NOTE user key is the string counted in self._user_names
+                report["users"] += sizeof(value)
+            else:
+                nbytes = sizeof(key) + sizeof(value)
+                # NOTE topic key is usually the string counted in self._topic_names
+                name = self._topic_names[self._topic_ids[key]]
+                report["topics"] += sizeof(value) if key is name else nbytes
+                topics.append((key, len(value), nbytes))
+        report["total"] = sum(report.values())
+        report["top_topics"] = heapq.nlargest(top_k, topics, key=lambda t: t[1])
+        return report
+
+    def export_posts(
+        self, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[dict[str, array | list]]:
+        """Stream visible posts as columnar record batches, oldest first
+
+        Snapshot is taken at the first batch: later posts are left out,
+        users deleted later are still exported, and the reaper is paused
+        until the export is exhausted or closed. No lock is held and only
+        one batch is in memory at a time.
+
+        Columns of a batch, Arrow-like:
+            post_id:            array[int]  post indice
+            author:             list[str]   user name
+            timestamp:          array[int]  timestamp
+            text:               list[str]   post
+            topic_ids:          array[int]  topic ids of all posts, flattened
+            topic_ids_offsets:  array[int]  topic ids of row i are
+                                            topic_ids[offsets[i]:offsets[i+1]]
+
+        Args:
+            batch_size (int): rows per batch. Defaults to $EXPORT_BATCH_SIZE.
+
+        Yields:
+            dict[str, array | list]: batch
+
+        Raises:
+            ValueError: if $batch_size is not positive
+        """
+        if batch_size <= 0:
+            raise ValueError(f"ERR: batch size {batch_size} must be positive.")
+        self._exports += 1
+        try:
+            end = len(self._posts)
+            deleted_users = frozenset(self._deleted_users)
+            for start in range(0, end, batch_size):
+                batch = {
+                    "post_id": array("I"),
+                    "author": [],
+                    "timestamp": array("q"),
+                    "text": [],
+                    "topic_ids": array("i"),
+                    "topic_ids_offsets": array("q", [0]),
+                }
+                for ind in range(start, min(start + batch_size, end)):
+                    post = self._posts[ind]
+                    author = self._authors[ind]
+                    if post is None or author in deleted_users:
+                        continue
+                    batch["post_id"].append(ind)
+                    batch["author"].append(self._user_names[author])
+                    batch["timestamp"].append(self._timestamps[ind])
+                    batch["text"].append(post)
+                    batch["topic_ids"].extend(self._get_post_topic_ids(ind))
+                    batch["topic_ids_offsets"].append(len(batch["topic_ids"]))
+                if batch["post_id"]:
+                    yield batch
+        finally:
+            self._exports -= 1
+
+    def export_topic_counts(
+        self, bucket_size: int, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[dict[str, array]]:
+        """Stream topic counts per time bucket as columnar record batches
+
+        Same snapshot as export_posts(). Buckets are walked in timestamp
+        order by bisecting the timeline, empty buckets are skipped, and only
+        the counts of the current bucket and batch are in memory.
+
+        Columns of a batch:
+            bucket:     array[int]  first timestamp of the bucket
+            topic_id:   array[int]  topic id, see export_topics()
+            count:      array[int]  posts of the bucket with the topic
+
+        Args:
+            bucket_size (int): timespan of a bucket
+            batch_size (int): rows per batch. Defaults to $EXPORT_BATCH_SIZE.
+
+        Yields:
+            dict[str, array]: batch
+
+        Raises:
+            ValueError: if $bucket_size or $batch_size is not positive
+        """
+        if bucket_size <= 0:
+            raise ValueError(f"ERR: bucket size {bucket_size} must be positive.")
+        if batch_size <= 0:
+            raise ValueError(f"ERR: batch size {batch_size} must be positive.")
+        self._exports += 1
+        try:
+            end = len(self._posts)
+            deleted_users = frozenset(self._deleted_users)
+            timestamps = self._timeline.timestamps
+            batch = None
+            lo = 0
+            while lo < len(timestamps):
+                bucket = timestamps[lo] // bucket_size * bucket_size
+                counts: dict[int, int] = dict()
+                for ind in self._timeline.range(bucket, bucket + bucket_size - 1):
+                    if (
+                        ind >= end
+                        or self._post_reaped[ind]
+                        or self._authors[ind] in deleted_users
+                    ):
+                        continue
+                    for topic_id in self._get_post_topic_ids(ind):
+                        counts[topic_id] = counts.get(topic_id, 0) + 1
+                for topic_id, count in sorted(counts.items()):
+                    if batch is None:
+                        batch = {
+                            "bucket": array("q"),
+                            "topic_id": array("i"),
+                            "count": array("I"),
+                        }
+                    batch["bucket"].append(bucket)
+                    batch["topic_id"].append(topic_id)
+                    batch["count"].append(count)
+                    if len(batch["bucket"]) >= batch_size:
+                        yield batch
+                        batch = None
+                # NOTE timeline may have changed while yielding, bisect again
+                lo = bisect_left(timestamps, bucket + bucket_size)
+            if batch is not None:
+                yield batch
+        finally:
+            self._exports -= 1
+
+    def export_topics(self) -> dict[str, array | list]:
+        """Get the topic id to topic table used by exports
+
+        Returns:
+            dict[str, array | list]: columns topic_id, topic (without '#')
+        """
+        return {
+            "topic_id": array("i", range(len(self._topic_names))),
+            "topic": [topic.lstrip("#") for topic in self._topic_names],
+        }
+
+    def dump(self, path: str) -> None:
+        """Serialize posts and indexes to $path, see load()
+
+        Metrics and spans are not serialized. The file is a pickle tagged
+        with $DUMP_FORMAT.
+
+        Args:
+            path (str): index file
+        """
+        import pickle
+
+        state = {
+            k: v for k, v in self.__dict__.items() if k not in self.TRANSIENT_ATTRIBUTES
+        }
+        dump = {"format": self.DUMP_FORMAT, "state": state}
+        with open(path, "wb") as f:
+            f.write(pickle.dumps(dump, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def load(cls, path: str, metrics: bool = False) -> "YodelrV1":
+        """Create Yodelr from an index file written by dump()
+
+        The file is read in one bulk read, then deserialized in memory,
+        so no post is re-indexed and no topic re-extracted.
+
+        WARNING: the file is unpickled, which can run arbitrary code. Only
+        load index files from a trusted source.
+
+        Args:
+            path (str): index file
+            metrics (bool): record latency of API calls. Defaults to False.
+
+        Returns:
+            YodelrV1: yodelr
+
+        Raises:
+            ValueError: if file was not written by dump() with $DUMP_FORMAT
+        """
+        import pickle
+
+        with open(path, "rb") as f:
+            dump = pickle.loads(f.read())
+        if not isinstance(dump, dict) or dump.get("format") != cls.DUMP_FORMAT:
+            found = dump.get("format") if isinstance(dump, dict) else None
+            raise ValueError(
+                f"ERR: index format {found} is not {cls.DUMP_FORMAT}, dump it again."
+            )
+        yodelr = cls(metrics=metrics)
+        state = dump["state"]
+        expected = yodelr.__dict__.keys() - set(cls.TRANSIENT_ATTRIBUTES)
+        if state.keys() != expected:
+            raise ValueError(
+                f"ERR: index attributes differ from format {cls.DUMP_FORMAT}: "
+                f"{sorted(state.keys() ^ expected)}"
+            )
+        yodelr.__dict__.update(state)
+        return yodelr
+
+    def enable_spans(self, enabled: bool = True) -> Spans:
+        """Switch on/off timing of named spans inside hot paths
+
+        Spans of add_post, delete_user and get_trending_topics are recorded
+        under the stack of their method, ie. get_trending_topics;sort
+
+        Args:
+            enabled (bool): switch. Defaults to True.
+
+        Returns:
+            Spans: recorded spans
+        """
+        self._spans.enabled = enabled
+        return self._spans
+
+    def _gauges(self) -> dict[str, int]:
+        """Gauges of the system
+
+        Returns:
+            dict[str, int]: gauge name -> value
+        """
+        index_bytes = sys.getsizeof(self._inverted_composite_index)
+        for v in self._inverted_composite_index.values():
+            index_bytes += sys.getsizeof(v)
+        index_bytes += sys.getsizeof(self._timeline.timestamps)
+        index_bytes += sys.getsizeof(self._timeline.inds)
+        return {
+            "posts": len(self._posts) - self._post_deleted,
+            "tombstones": self._post_deleted,
+            "topics": self._topics,
+            "reap_pending": sum(len(inds) for _, inds in self._reap_queue),
+            "index_bytes": index_bytes,
+        }
+
+    def _get_posts_in_timespan(
+        self,
+        inds: PostingList,
+        from_timestamp: Timestamp | None,
+        to_timestamp: Timestamp | None,
+    ) -> list[Post]:
+        """Get posts of a posting list within a timespan, latest arrived first
+
+        High-water marks increase monotonically with post indices, so a
+        posting list is sorted by high-water mark. A post in timespan has
+        its high-water mark in [from, to + $MAX_REORDER_DELAY], found by
+        bisection, then its own timestamp is checked: O(log n + k) with
+        k posts in the widened timespan.
+
+        Args:
+            inds (PostingList): posting list
+            from_timestamp (Timestamp | None): oldest timestamp, None if unbounded
+            to_timestamp (Timestamp | None): latest timestamp, None if unbounded
+
+        Returns:
+            list[Post]: posts
+        """
+        lo, hi = 0, len(inds)
+        key = self._high_waters.__getitem__
+        if from_timestamp is None:
+            from_timestamp = float("-inf")
+        else:
+            lo = bisect_left(inds, from_timestamp, key=key)
+        if to_timestamp is None:
+            to_timestamp = float("inf")
+        else:
+            hi = bisect_right(inds, to_timestamp + self.MAX_REORDER_DELAY, lo, key=key)
+        logger.debug("> timespan indices: [%s, %s[", lo, hi)
+        posts = []
+        for i in range(hi - 1, lo - 1, -1):
+            ind = inds[i]
+            # NOTE skip post marked as removed or out of timespan
+            if from_timestamp <= self._timestamps[
+                ind
+            ] <= to_timestamp and self._is_post_alive(ind):
+                posts.append(self._posts[ind])  # latest at ind=0
+        return posts
+
+    def _get_post_topic_ids(self, ind: int) -> array:
+        """Get topic ids of a post, see export_topics()
+
+        Args:
+            ind (int): post indice
+
+        Returns:
+            array: topic ids, in order of appearance in post
+        """
+        offsets = self._post_topic_offsets
+        return self._post_topic_ids[offsets[ind] : offsets[ind + 1]]
+
+    def _compact(self, max_entries: int) -> int:
+        """Resume compaction of timeline then of queued topics
+
+        Timeline compaction starts once more than half of its entries are
+        reaped posts. A topic compaction is queued by reap().
+
+        Args:
+            max_entries (int): bound of work
+
+        Returns:
+            int: entries scanned
+        """
+        scanned = 0
+        timeline = self._timeline
+        # NOTE timeline holds every post not reaped, and some reaped ones
+        dead = len(timeline) - (len(self._posts) - self._reaped)
+        if timeline.compacting or dead * 2 > len(timeline):
+            scanned += timeline.compact(self._is_post_kept, max_entries)
+        while self._compactions and scanned < max_entries:
+            topic, compaction = next(iter(self._compactions.items()))
+            scanned += compaction.step(self._is_post_kept, max_entries - scanned)
+            if compaction.done:
+                # NOTE copy caught up with appends, swap in O(1)
+                self._inverted_composite_index[topic] = compaction.targets[0]
+                del self._compactions[topic]
+        return scanned
+
+    def _is_post_kept(self, ind: int) -> bool:
+        """Check post is not removed by the reaper
+
+        Args:
+            ind (int): post indice
+
+        Returns:
+            bool: True if post is not removed
+        """
+        return not self._post_reaped[ind]
+
+    def _is_post_alive(self, ind: int) -> bool:
+        """Check post is neither removed nor from a deleted user pending reap
+
+        Args:
+            ind (int): post indice
+
+        Returns:
+            bool: True if post is visible
+        """
+        return self._posts[ind] is not None and (
+            not self._deleted_users or self._authors[ind] not in self._deleted_users
+        )
+
     def _is_user_in_system(self, user: User) -> bool:
         """Check if user registered in system
 
@@ -248,9 +946,12 @@ class YodelrV1(Yodelr):
         """[FOR TEST ONLY]
 
         Returns:
-            list[Topic]: all topic
+            bool: True if a visible post is at $timestamp
         """
-        return self._inverted_composite_index.get(timestamp, False)
+        return any(
+            self._is_post_alive(ind)
+            for ind in self._timeline.range(timestamp, timestamp)
+        )
 
     @classmethod
     def _extract_topics(cls, post_text: str, case_sensitive=True) -> list[Topic]:
@@ -2,7 +2,6 @@
 # Not for redistribution outside of candidate interview context.
 
 from abc import ABC, abstractmethod
-from typing import List
 
 
 class Yodelr(ABC):
@@ -26,21 +25,23 @@ class Yodelr(ABC):
         pass
 
     @abstractmethod
-    def get_posts_for_user(self, user_name: str) -> List[str]:
+    def get_posts_for_user(self, user_name: str) -> list[str]:
         pass
 
     @abstractmethod
-    def get_posts_for_topic(self, topic: str) -> List[str]:
+    def get_posts_for_topic(self, topic: str) -> list[str]:
         pass
 
     @abstractmethod
-    def get_trending_topics(self, from_timestamp: int, to_timestamp: int) -> List[str]:
+    def get_trending_topics(self, from_timestamp: int, to_timestamp: int) -> list[str]:
         pass
 
 
 class YodelrError(Exception):
 
     UNKNOWN_USER = 100
+    LATE_POST = 101
+    INVALID_TIMESTAMP = 102
 
     def __init__(self, error_code: int, message: str = ""):
         self.error_code = error_code